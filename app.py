@@ -68,7 +68,7 @@ banking_facade.addObserver(audit_observer)
 account_service = AccountService(banking_facade)
 transaction_service = TransactionService(banking_facade)
 notification_service = NotificationService(banking_facade)
-approval_service = ApprovalService(banking_facade)
+approval_service = ApprovalService(banking_facade, transaction_service)
 report_service = ReportService(banking_facade)
 
 
@@ -98,6 +98,12 @@ app.register_blueprint(employee_bp)
 app.register_blueprint(admin_bp)
 
 
+@app.teardown_request
+def clear_request_caches(exc):
+    """Drop per-request memoized state so nothing leaks into the next request"""
+    transaction_service.clear_authz_cache()
+
+
 # --------------------------------------------------
 # Routes
 # --------------------------------------------------
@@ -139,7 +145,7 @@ def login():
             # Database is always required - use UserRepository for authentication
             try:
                 from database.repository import UserRepository
-                from security.password import verify_password
+                from security.password import verify_password, needs_rehash, hash_password
 
                 user = UserRepository.get_by_username(username)
                 
@@ -164,6 +170,10 @@ def login():
                         flash('Invalid username, email/phone, or password.', 'error')
                         return render_template('login.html', role=role_str)
                     
+                    # Upgrade legacy or outdated password hashes
+                    if needs_rehash(user.password_hash):
+                        UserRepository.update_password_hash(user.user_id, hash_password(password))
+                    
                     # Verify role matches
                     if user.role.value != role.value:
                         flash(f'User {username} is not registered as {role.value}.', 'error')
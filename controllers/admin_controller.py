@@ -1,7 +1,8 @@
 """
 Admin controller - handles admin routes
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+import orjson
+from flask import Blueprint, render_template, request, redirect, url_for, flash, Response, stream_with_context
 from domain.roles.role import Role
 from services.transaction_service import TransactionService
 from services.approval_service import ApprovalService
@@ -24,7 +25,9 @@ def init_admin_controller(transaction_service: TransactionService,
     @require_role(Role.ADMIN)
     def dashboard():
         """Admin dashboard"""
-        pending_approvals = approval_service.get_pending_approvals(Role.ADMIN)
+        pending_approvals = approval_service.get_pending_approvals(
+            Role.ADMIN, page=request.args.get('page', type=int)
+        )
         financial_summary = report_service.get_financial_summary()
         daily_report = report_service.get_daily_transaction_report()
         
@@ -80,6 +83,20 @@ def init_admin_controller(transaction_service: TransactionService,
                              financial_summary=financial_summary,
                              audit_log=audit_log[:50])  # Last 50 entries
     
+    @admin_bp.route('/audit_log.json')
+    @require_role(Role.ADMIN)
+    def audit_log_json():
+        """Export the audit log as column-oriented JSON"""
+        return Response(orjson.dumps(report_service.get_audit_log_columns()),
+                        mimetype='application/json')
+    
+    @admin_bp.route('/audit_log.ndjson')
+    @require_role(Role.ADMIN)
+    def audit_log_stream():
+        """Stream the full audit log as newline-delimited JSON"""
+        return Response(stream_with_context(report_service.iter_audit_log()),
+                        mimetype='application/x-ndjson')
+    
     @admin_bp.route('/update_earnings', methods=['POST'])
     @require_role(Role.ADMIN)
     def update_earnings():
@@ -118,19 +135,21 @@ def init_admin_controller(transaction_service: TransactionService,
                 accounts_by_owner[owner_id] = []
             accounts_by_owner[owner_id].append(account)
         
-        # Organize transactions by account
+        # Organize transactions by account and total them by type in one pass
         transactions_by_account = {}
+        totals_by_type = {'deposit': 0.0, 'withdrawal': 0.0, 'transfer': 0.0}
         for transaction in all_transactions:
             acc_id = transaction.account_id
             if acc_id not in transactions_by_account:
                 transactions_by_account[acc_id] = []
             transactions_by_account[acc_id].append(transaction)
+            totals_by_type[transaction.type_value] += transaction.amount
         
         # Calculate statistics
         total_balance = sum(acc.balance for acc in all_accounts)
-        total_deposits = sum(t.amount for t in all_transactions if t.transaction_type.value == 'deposit')
-        total_withdrawals = sum(t.amount for t in all_transactions if t.transaction_type.value == 'withdrawal')
-        total_transfers = sum(t.amount for t in all_transactions if t.transaction_type.value == 'transfer')
+        total_deposits = totals_by_type['deposit']
+        total_withdrawals = totals_by_type['withdrawal']
+        total_transfers = totals_by_type['transfer']
         
         # Account type distribution
         account_type_count = {}
@@ -65,11 +65,11 @@ def init_client_controller(account_service: AccountService,
                 return redirect(url_for('client.access'))
             
             account = account_service.get_account(account_id)
-            transactions = transaction_service.get_account_transactions(account_id)
+            transactions = transaction_service.get_recent_transactions(account_id, 10)
             
             return render_template('client/account.html', 
                                  account=account, 
-                                 transactions=transactions[-10:],  # Last 10
+                                 transactions=transactions,  # Last 10
                                  is_own_account=True,
                                  authenticated_account_id=authenticated_account_id)
         except BankingSystemError as e:
@@ -27,7 +27,9 @@ def init_employee_controller(transaction_service: TransactionService,
     def dashboard():
         """Employee dashboard"""
         user_role = get_current_user_role()
-        pending_approvals = approval_service.get_pending_approvals(user_role)
+        pending_approvals = approval_service.get_pending_approvals(
+            user_role, page=request.args.get('page', type=int)
+        )
         daily_report = report_service.get_daily_transaction_report()
         return render_template('employee/dashboard.html',
                              pending_approvals=pending_approvals,
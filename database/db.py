@@ -4,14 +4,34 @@ Uses Flask-SQLAlchemy for ORM and session handling
 """
 
 import sys
+from functools import wraps
 import psycopg2
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from config import DATABASE_URI
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from config import DATABASE_URI, DB_POOL_SIZE
+
+# PostgreSQL SQLSTATE raised when a SERIALIZABLE transaction cannot be committed
+SERIALIZATION_FAILURE = '40001'
 
 # Flask-SQLAlchemy instance
 db = SQLAlchemy()
 
+# Session.info flag set once the open transaction has written through the ORM
+_WRITES_KEY = 'has_writes'
+
+# Indexes added after the initial schema. The models declare them, but
+# create_all() only creates indexes for new tables, so they are backfilled
+# on existing databases.
+INDEXES_TABLE = 'transactions'
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_transactions_created_at ON transactions (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_acct_created ON transactions (account_id, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_target_created ON transactions (target_account_id, created_at DESC)",
+]
+
 
 def init_db(app: Flask):
     """
@@ -21,6 +41,7 @@ def init_db(app: Flask):
     1. Configures Flask-SQLAlchemy
     2. Binds the database to the Flask app
     3. Creates all tables defined in database.models
+    4. Adds any indexes missing from an existing schema
 
     Must be called once when the app starts,
     BEFORE importing any repository modules.
@@ -30,6 +51,7 @@ def init_db(app: Flask):
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': DB_POOL_SIZE,
         'pool_pre_ping': True,
         'pool_recycle': 300,
     }
@@ -37,9 +59,94 @@ def init_db(app: Flask):
     # Bind SQLAlchemy to app
     db.init_app(app)
 
+    # Register the models on db.metadata so create_all() knows their tables
+    import database.models
+
     # Create tables inside application context
     with app.app_context():
         db.create_all()
+        if inspect(db.engine).has_table(INDEXES_TABLE):
+            for statement in INDEXES:
+                db.session.execute(text(statement))
+            db.session.commit()
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush_write(session, flush_context):
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _clear_write_mark(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_WRITES_KEY, None)
+
+
+def end_read_only_transaction():
+    """
+    Close the session's open transaction if it has only read, so the caller can
+    begin a new unit of work (e.g. at another isolation level).
+    
+    Raises:
+        RuntimeError: if the transaction has pending or executed ORM writes;
+            those belong to the caller, who must commit or roll them back first
+    """
+    session = db.session()
+    # Pending objects are checked even without an open transaction: they would
+    # otherwise be autoflushed into the caller's next unit of work
+    if session.new or session.dirty or session.deleted or session.info.get(_WRITES_KEY):
+        raise RuntimeError(
+            "The session has uncommitted changes; commit or roll back before starting a new unit of work"
+        )
+    if session.in_transaction():
+        session.rollback()
+
+
+def set_transaction_isolation(level: str):
+    """
+    Run the session's next database transaction at the given isolation level.
+    
+    The level can only be chosen when a transaction begins, so this must be
+    called at a transaction boundary (see end_read_only_transaction). The pooled
+    connection is reset to the default level when it is released.
+    
+    Args:
+        level: Isolation level name, e.g. 'SERIALIZABLE'
+    
+    Raises:
+        RuntimeError: if the session already has a transaction open
+    """
+    session = db.session()
+    if session.in_transaction():
+        raise RuntimeError(f"Cannot switch to {level} isolation inside an open transaction")
+    session.connection(execution_options={'isolation_level': level})
+
+
+def retry_on_serialization_failure(max_attempts: int = 3):
+    """
+    Decorator that re-runs a unit of work when PostgreSQL aborts it with a
+    serialization failure. The session is rolled back before each retry;
+    other errors propagate unchanged.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except DBAPIError as e:
+                    db.session.rollback()
+                    pgcode = getattr(e.orig, 'pgcode', None)
+                    if pgcode != SERIALIZATION_FAILURE or attempt == max_attempts:
+                        raise
+        return wrapper
+    return decorator
 
 
 def setup_database(postgres_password: str):
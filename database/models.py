@@ -3,7 +3,7 @@ SQLAlchemy database models
 """
 from datetime import datetime
 from database.db import db
-from sqlalchemy import Column, String, Float, Integer, DateTime, Enum as SQLEnum, ForeignKey, Boolean
+from sqlalchemy import Column, String, Float, Integer, DateTime, Enum as SQLEnum, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -126,13 +126,19 @@ class Transaction(db.Model):
     status = Column(SQLEnum(TransactionStatusEnum, native_enum=False, length=20), default=TransactionStatusEnum.PENDING, nullable=False)
     description = Column(String(500), nullable=True)
     approved_by = Column(String(100), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     approved_at = Column(DateTime, nullable=True)
     
     # Relationships
     account = relationship('Account', foreign_keys=[account_id], back_populates='transactions')
     target_account = relationship('Account', foreign_keys=[target_account_id])
     
+    # Per-account history, newest first (see TransactionRepository.get_recent_by_account)
+    __table_args__ = (
+        Index('ix_tx_acct_created', account_id, created_at.desc()),
+        Index('ix_tx_target_created', target_account_id, created_at.desc()),
+    )
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -1,10 +1,14 @@
 """
 Database repository for banking operations
 """
-import re
+import csv
+import io
 import random
 import string
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Dict, Tuple, Any, Iterator
+from sqlalchemy import select, update, case, and_, or_, values, column, func, String, Float
+from sqlalchemy.orm import aliased
 from database.db import db
 from database.models import (
     User as UserModel, Account as AccountModel, Transaction as TransactionModel, 
@@ -14,16 +18,23 @@ from database.models import (
 from domain.account.account import Account
 from domain.account.account_type import AccountType
 from domain.transaction.transaction import Transaction, TransactionType, TransactionStatus
-from patterns.state.account_state import ActiveState, FrozenState, SuspendedState, ClosedState
+from patterns.state.account_state import ACTIVE, FROZEN, SUSPENDED, CLOSED
 from domain.roles.role import Role
 from utils.exceptions import AccountNotFoundError
 from datetime import datetime
 
 
 # IBAN (International Bank Account Number) utilities
+
+# Maps A-Z to "10".."35" for the MOD-97 checksum
+_IBAN_LETTER_DIGITS = {ord(c): str(ord(c) - ord('A') + 10) for c in string.ascii_uppercase}
+
+
+@lru_cache(maxsize=4096)
 def validate_iban(iban: str) -> bool:
     """
     Validate IBAN format and checksum according to ISO 13616 standard.
+    Results are cached since the same IBAN is often checked repeatedly (login retries).
     
     Args:
         iban: IBAN string to validate
@@ -41,38 +52,21 @@ def validate_iban(iban: str) -> bool:
     if len(iban) < 15 or len(iban) > 34:
         return False
     
-    # Must start with 2 letters (country code)
-    if not re.match(r'^[A-Z]{2}', iban):
-        return False
-    
-    # Must contain only alphanumeric characters
-    if not re.match(r'^[A-Z0-9]+$', iban):
-        return False
-    
-    # Basic format validation: Country code (2) + Check digits (2) + BBAN (variable)
-    if len(iban) < 4:
+    # Must be ASCII alphanumeric and start with 2 letters (country code)
+    if not (iban.isascii() and iban.isalnum() and iban[:2].isalpha()):
         return False
     
-    # Validate checksum using MOD-97 algorithm
-    try:
-        # Move first 4 characters to end
-        rearranged = iban[4:] + iban[:4]
-        
-        # Replace letters with numbers (A=10, B=11, ..., Z=35)
-        numeric = ''
-        for char in rearranged:
-            if char.isdigit():
-                numeric += char
-            else:
-                numeric += str(ord(char) - ord('A') + 10)
-        
-        # Calculate MOD-97
-        remainder = int(numeric) % 97
-        
-        # Valid IBAN has remainder of 1
-        return remainder == 1
-    except (ValueError, TypeError):
-        return False
+    # Validate checksum using MOD-97: move first 4 characters to end,
+    # replace letters with numbers (A=10, ..., Z=35), then reduce the digit
+    # string 9 digits at a time so no big integer is ever built
+    numeric = (iban[4:] + iban[:4]).translate(_IBAN_LETTER_DIGITS)
+    remainder = 0
+    for i in range(0, len(numeric), 9):
+        chunk = numeric[i:i + 9]
+        remainder = (remainder * 10 ** len(chunk) + int(chunk)) % 97
+    
+    # Valid IBAN has remainder of 1
+    return remainder == 1
 
 
 def generate_iban(country_code: str = 'US', account_id: str = None) -> str:
@@ -225,6 +219,14 @@ class UserRepository:
             user.role = RoleEnum(role.value)
             db.session.commit()
     
+    @staticmethod
+    def update_password_hash(user_id: str, password_hash: str):
+        """Replace a user's stored password hash"""
+        user = UserRepository.get(user_id)
+        if user:
+            user.password_hash = password_hash
+            db.session.commit()
+    
     @staticmethod
     def get_all_employees() -> List[UserModel]:
         """Get all employees"""
@@ -241,11 +243,13 @@ class UserRepository:
         Verify user credentials (username + password).
         Returns UserModel if credentials are valid, None otherwise.
         """
-        from security.password import verify_password
+        from security.password import verify_password, needs_rehash, hash_password
         
         user = UserRepository.get_by_username(username)
         if user and user.password_hash:
             if verify_password(user.password_hash, password):
+                if needs_rehash(user.password_hash):
+                    UserRepository.update_password_hash(user.user_id, hash_password(password))
                 return user
         return None
 
@@ -253,6 +257,13 @@ class UserRepository:
 class AccountRepository:
     """Repository for account operations"""
     
+    _STATE_MAP = {
+        AccountStateEnum.ACTIVE: ACTIVE,
+        AccountStateEnum.FROZEN: FROZEN,
+        AccountStateEnum.SUSPENDED: SUSPENDED,
+        AccountStateEnum.CLOSED: CLOSED
+    }
+    
     @staticmethod
     def create(account_id: str, account_type: AccountType, owner_id: str, 
               balance: float, parent_account_id: Optional[str] = None,
@@ -290,6 +301,12 @@ class AccountRepository:
             raise AccountNotFoundError(f"Account {account_id} not found")
         return account
     
+    @staticmethod
+    def get_many(account_ids) -> Dict[str, AccountModel]:
+        """Get several accounts in one query, keyed by account ID (missing IDs are absent)"""
+        accounts = AccountModel.query.filter(AccountModel.account_id.in_(list(account_ids))).all()
+        return {account.account_id: account for account in accounts}
+    
     @staticmethod
     def get_by_owner(owner_id: str) -> List[AccountModel]:
         """Get all accounts for owner"""
@@ -304,13 +321,39 @@ class AccountRepository:
         iban_clean = iban.replace(' ', '').upper()
         return AccountModel.query.filter_by(iban=iban_clean).first()
     
+    @staticmethod
+    def generate_unique_ibans(account_ids: List[str]) -> Dict[str, str]:
+        """
+        Generate IBANs for several new accounts, checking all candidates in one query.
+        IBANs already stored or repeated within the batch are replaced by random ones and re-checked.
+        """
+        ibans: Dict[str, str] = {}
+        candidates = {account_id: generate_iban('US', account_id) for account_id in account_ids}
+        while candidates:
+            taken = set(db.session.scalars(
+                select(AccountModel.iban).where(AccountModel.iban.in_(list(candidates.values())))
+            ).all())
+            taken.update(ibans.values())
+            retry = {}
+            for account_id, iban in candidates.items():
+                if iban in taken:
+                    retry[account_id] = generate_iban('US')
+                else:
+                    ibans[account_id] = iban
+                    taken.add(iban)
+            candidates = retry
+        return ibans
+    
     @staticmethod
     def get_by_account_id_and_iban(account_id: str, iban: str) -> Optional[AccountModel]:
         """Get account by both account_id and IBAN (for authentication)"""
         if not account_id or not iban:
             return None
         iban_clean = iban.replace(' ', '').upper()
-        account = AccountModel.query.filter_by(account_id=account_id, iban=iban_clean).first()
+        # Primary-key lookup (served from the identity map when already loaded)
+        account = db.session.get(AccountModel, account_id)
+        if account is None or account.iban != iban_clean:
+            return None
         return account
     
     @staticmethod
@@ -352,6 +395,29 @@ class AccountRepository:
         """Get all accounts"""
         return AccountModel.query.all()
     
+    @staticmethod
+    def financial_summary() -> Dict[str, Any]:
+        """
+        Aggregate account balances in a single query.
+        
+        Returns:
+            Dict with total_deposits (sum of positive balances), total_loans
+            (sum of negative balances, as a positive amount), total_accounts
+            and active_accounts
+        """
+        total_deposits, total_loans, total_accounts, active_accounts = db.session.query(
+            func.coalesce(func.sum(case((AccountModel.balance > 0, AccountModel.balance), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((AccountModel.balance < 0, -AccountModel.balance), else_=0.0)), 0.0),
+            func.count(AccountModel.account_id),
+            func.coalesce(func.sum(case((AccountModel.state == AccountStateEnum.ACTIVE, 1), else_=0)), 0)
+        ).one()
+        return {
+            'total_deposits': total_deposits,
+            'total_loans': total_loans,
+            'total_accounts': total_accounts,
+            'active_accounts': active_accounts
+        }
+    
     @staticmethod
     def update_balance(account_id: str, new_balance: float):
         """Update account balance"""
@@ -359,6 +425,77 @@ class AccountRepository:
         account.balance = new_balance
         db.session.commit()
     
+    @staticmethod
+    def update_balances_batch(balances: List[Tuple[str, float]], commit: bool = True):
+        """
+        Update several account balances with a single
+        UPDATE ... FROM (VALUES ...) statement.
+        
+        Args:
+            balances: (account_id, new_balance) pairs
+            commit: False leaves committing to the caller's transaction
+        """
+        if not balances:
+            return
+        new_balances = values(
+            column('account_id', String), column('balance', Float),
+            name='new_balances'
+        ).data(balances)
+        stmt = (
+            update(AccountModel)
+            .where(AccountModel.account_id == new_balances.c.account_id)
+            .values(balance=new_balances.c.balance)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(stmt)
+        if commit:
+            db.session.commit()
+    
+    @staticmethod
+    def transfer_balance(from_account_id: str, to_account_id: str, amount: float,
+                         owner_id: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Move funds between two accounts with a single guarded UPDATE.
+        The source must be active, hold at least `amount` and (if given) belong
+        to owner_id; the destination must not be closed.
+        
+        The change is left uncommitted so the caller can persist the matching
+        transaction row in the same database transaction.
+        
+        Returns:
+            New balances keyed by account_id, or None if the guard rejected the
+            transfer. The UPDATE may then have changed one of the two rows, so the
+            caller must roll its transaction back.
+        """
+        source_ok = and_(
+            AccountModel.account_id == from_account_id,
+            AccountModel.state == AccountStateEnum.ACTIVE,
+            AccountModel.balance >= amount
+        )
+        if owner_id is not None:
+            source_ok = and_(source_ok, AccountModel.owner_id == owner_id)
+        target_ok = and_(
+            AccountModel.account_id == to_account_id,
+            AccountModel.state != AccountStateEnum.CLOSED
+        )
+        
+        stmt = (
+            update(AccountModel)
+            .where(or_(source_ok, target_ok))
+            .values(balance=AccountModel.balance + case(
+                (AccountModel.account_id == to_account_id, amount),
+                else_=-amount
+            ))
+            .returning(AccountModel.account_id, AccountModel.balance)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.session.execute(stmt).all()
+        
+        # Both rows must pass their guard
+        if len(rows) != 2:
+            return None
+        return {account_id: balance for account_id, balance in rows}
+    
     @staticmethod
     def update_state(account_id: str, state: AccountStateEnum):
         """Update account state"""
@@ -380,26 +517,44 @@ class AccountRepository:
             iban=db_account.iban
         )
         
-        # Set state
-        state_map = {
-            AccountStateEnum.ACTIVE: ActiveState(),
-            AccountStateEnum.FROZEN: FrozenState(),
-            AccountStateEnum.SUSPENDED: SuspendedState(),
-            AccountStateEnum.CLOSED: ClosedState()
-        }
-        account.set_state(state_map[db_account.state])
+        # Set state (shared state instances, no per-account allocation)
+        account.set_state(AccountRepository._STATE_MAP[db_account.state])
         account.is_closed = db_account.is_closed
         
         return account
 
 
+def _copy_rows(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+    """Stream rows into a table with one COPY ... FROM STDIN (psycopg 3 or psycopg2 cursor)"""
+    copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    if hasattr(cursor, 'copy'):
+        with cursor.copy(copy_sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # \N marks NULL so empty strings survive the round trip
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(f"{copy_sql} WITH (FORMAT csv, NULL '\\N')", buffer)
+
+
 class TransactionRepository:
     """Repository for transaction operations"""
     
+    # Column order written by bulk_create
+    _COPY_COLUMNS = ('transaction_id', 'transaction_type', 'account_id', 'target_account_id', 'amount',
+                     'status', 'description', 'approved_by', 'created_at', 'approved_at')
+    
     @staticmethod
     def create(transaction_id: str, transaction_type: TransactionType,
               account_id: str, amount: float, target_account_id: Optional[str] = None,
-              description: str = "") -> TransactionModel:
+              description: str = "",
+              status: TransactionStatusEnum = TransactionStatusEnum.PENDING,
+              approved_by: Optional[str] = None) -> TransactionModel:
         """Create transaction in database"""
         transaction = TransactionModel(
             transaction_id=transaction_id,
@@ -408,24 +563,90 @@ class TransactionRepository:
             target_account_id=target_account_id,
             amount=amount,
             description=description,
-            status=TransactionStatusEnum.PENDING
+            status=status,
+            approved_by=approved_by,
+            approved_at=datetime.utcnow() if approved_by else None
         )
         db.session.add(transaction)
         db.session.commit()
         return transaction
     
+    @staticmethod
+    def bulk_create(rows: List[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Insert many transactions with a single COPY instead of one INSERT each
+        
+        Each row takes create()'s arguments as keys, plus optional created_at/approved_at.
+        COPY runs on the session's connection, so commit=False joins the caller's transaction.
+        
+        Returns:
+            Number of transactions inserted
+        """
+        if not rows:
+            return 0
+        
+        now = datetime.utcnow()
+        records = []
+        for row in rows:
+            approved_by = row.get('approved_by')
+            # Enums are stored by name (non-native SQLAlchemy Enum columns)
+            records.append((
+                row['transaction_id'],
+                TransactionTypeEnum(row['transaction_type'].value).name,
+                row['account_id'],
+                row.get('target_account_id'),
+                row['amount'],
+                row.get('status', TransactionStatusEnum.PENDING).name,
+                row.get('description', ""),
+                approved_by,
+                row.get('created_at') or now,
+                row.get('approved_at') or (now if approved_by else None)
+            ))
+        
+        try:
+            cursor = db.session.connection().connection.cursor()
+            _copy_rows(cursor, 'transactions', TransactionRepository._COPY_COLUMNS, records)
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(records)
+    
     @staticmethod
     def get(transaction_id: str) -> TransactionModel:
         """Get transaction by ID"""
         return TransactionModel.query.get(transaction_id)
     
     @staticmethod
-    def get_by_account(account_id: str) -> List[TransactionModel]:
-        """Get transactions for account"""
+    def get_by_account(account_id: str, limit: Optional[int] = None,
+                       offset: int = 0) -> List[TransactionModel]:
+        """Get transactions for account, optionally one page of them oldest first"""
+        query = TransactionModel.query.filter(
+            (TransactionModel.account_id == account_id) | 
+            (TransactionModel.target_account_id == account_id)
+        )
+        if limit is not None:
+            query = query.order_by(TransactionModel.created_at).offset(offset).limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def get_recent_by_account(account_id: str, limit: int = 10) -> List[TransactionModel]:
+        """Get the most recent transactions for account, oldest first"""
+        recent = TransactionModel.query.filter(
+            (TransactionModel.account_id == account_id) | 
+            (TransactionModel.target_account_id == account_id)
+        ).order_by(TransactionModel.created_at.desc()).limit(limit).all()
+        recent.reverse()
+        return recent
+    
+    @staticmethod
+    def count_by_account(account_id: str) -> int:
+        """Count transactions for account"""
         return TransactionModel.query.filter(
             (TransactionModel.account_id == account_id) | 
             (TransactionModel.target_account_id == account_id)
-        ).all()
+        ).count()
     
     @staticmethod
     def get_all() -> List[TransactionModel]:
@@ -433,9 +654,118 @@ class TransactionRepository:
         return TransactionModel.query.all()
     
     @staticmethod
-    def get_pending() -> List[TransactionModel]:
-        """Get pending transactions"""
-        return TransactionModel.query.filter_by(status=TransactionStatusEnum.PENDING).all()
+    def iter_all(batch_size: int = 10_000) -> Iterator[TransactionModel]:
+        """Iterate over all transactions, fetching batch_size rows at a time from a server-side cursor"""
+        return iter(TransactionModel.query.yield_per(batch_size))
+    
+    @staticmethod
+    def get_between(start: datetime, end: datetime) -> List[TransactionModel]:
+        """Get transactions created in [start, end)"""
+        return TransactionModel.query.filter(
+            TransactionModel.created_at >= start,
+            TransactionModel.created_at < end
+        ).all()
+    
+    @staticmethod
+    def get_totals_between(start: datetime, end: datetime) -> Dict[str, float]:
+        """Get summed amounts per transaction type for transactions created in [start, end)"""
+        rows = db.session.query(
+            TransactionModel.transaction_type, func.sum(TransactionModel.amount)
+        ).filter(
+            TransactionModel.created_at >= start,
+            TransactionModel.created_at < end
+        ).group_by(TransactionModel.transaction_type).all()
+        return {transaction_type.value: total for transaction_type, total in rows}
+    
+    @staticmethod
+    def get_pending(max_amount: Optional[float] = None, limit: Optional[int] = None,
+                    offset: int = 0) -> List[TransactionModel]:
+        """Get pending transactions oldest first, optionally only those up to max_amount and one page of them"""
+        query = TransactionModel.query.filter_by(status=TransactionStatusEnum.PENDING)
+        if max_amount is not None:
+            query = query.filter(TransactionModel.amount <= max_amount)
+        query = query.order_by(TransactionModel.created_at)
+        if limit is not None:
+            query = query.offset(offset).limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def approve_pending(transaction_id: str, approved_by: str,
+                        max_amount: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """
+        Approve a pending transaction and apply it to the account balances in one
+        statement: a data-modifying CTE marks the transaction COMPLETED and the
+        outer UPDATE moves the funds.
+        The transaction must be pending and (if given) at most max_amount; a debited
+        source must be active and hold the amount, a credited account must not be closed.
+        
+        The change is left uncommitted so the caller decides when to commit.
+        
+        Returns:
+            New balances keyed by account_id, or None if the guard rejected the
+            approval (nothing was changed)
+        """
+        source = aliased(AccountModel)
+        target = aliased(AccountModel)
+        is_deposit = TransactionModel.transaction_type == TransactionTypeEnum.DEPOSIT
+        
+        source_ok = select(source.account_id).where(
+            source.account_id == TransactionModel.account_id,
+            or_(
+                and_(is_deposit, source.state != AccountStateEnum.CLOSED),
+                and_(~is_deposit, source.state == AccountStateEnum.ACTIVE,
+                     source.balance >= TransactionModel.amount)
+            )
+        ).exists()
+        target_ok = or_(
+            TransactionModel.target_account_id.is_(None),
+            and_(
+                TransactionModel.target_account_id != TransactionModel.account_id,
+                select(target.account_id).where(
+                    target.account_id == TransactionModel.target_account_id,
+                    target.state != AccountStateEnum.CLOSED
+                ).exists()
+            )
+        )
+        conditions = [
+            TransactionModel.transaction_id == transaction_id,
+            TransactionModel.status == TransactionStatusEnum.PENDING,
+            source_ok,
+            target_ok
+        ]
+        if max_amount is not None:
+            conditions.append(TransactionModel.amount <= max_amount)
+        
+        approved = (
+            update(TransactionModel)
+            .where(*conditions)
+            .values(status=TransactionStatusEnum.COMPLETED, approved_by=approved_by,
+                    approved_at=datetime.utcnow())
+            .returning(TransactionModel.transaction_type, TransactionModel.account_id,
+                       TransactionModel.target_account_id, TransactionModel.amount)
+            .cte('approved')
+        )
+        debit = or_(
+            approved.c.transaction_type == TransactionTypeEnum.WITHDRAWAL,
+            and_(approved.c.transaction_type == TransactionTypeEnum.TRANSFER,
+                 AccountModel.account_id == approved.c.account_id)
+        )
+        stmt = (
+            update(AccountModel)
+            .where(or_(AccountModel.account_id == approved.c.account_id,
+                       AccountModel.account_id == approved.c.target_account_id))
+            .values(balance=AccountModel.balance + case(
+                (debit, -approved.c.amount),
+                else_=approved.c.amount
+            ))
+            .returning(AccountModel.account_id, AccountModel.balance)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.session.execute(stmt).all()
+        
+        if not rows:
+            return None
+        return {account_id: balance for account_id, balance in rows}
     
     @staticmethod
     def update_status(transaction_id: str, status: TransactionStatusEnum, 
@@ -468,6 +798,8 @@ class TransactionRepository:
             TransactionStatusEnum.COMPLETED: TransactionStatus.COMPLETED
         }
         transaction.status = status_map[db_transaction.status]
+        if db_transaction.created_at:
+            transaction.created_at = db_transaction.created_at
         transaction.approved_by = db_transaction.approved_by
         transaction.approved_at = db_transaction.approved_at
         
@@ -478,13 +810,16 @@ class FinancialsRepository:
     """Repository for bank financials"""
     
     @staticmethod
-    def get_or_create() -> BankFinancials:
-        """Get or create financials record"""
+    def get_or_create(commit: bool = True) -> BankFinancials:
+        """Get or create financials record; commit=False leaves it to the caller's transaction"""
         financials = BankFinancials.query.first()
         if not financials:
             financials = BankFinancials(retained_earnings=0.0)
             db.session.add(financials)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
         return financials
     
     @staticmethod
@@ -4,8 +4,9 @@ Account domain model
 from typing import Optional
 from datetime import datetime
 from domain.account.account_type import AccountType
-from patterns.state.account_state import AccountState, ActiveState
+from patterns.state.account_state import AccountState, ACTIVE
 from utils.exceptions import InvalidStateTransitionError, InsufficientFundsError
+from utils.money import to_cents, from_cents
 
 
 class Account:
@@ -20,7 +21,7 @@ class Account:
         self.owner_id = owner_id
         self.balance = balance
         self.parent_account_id = parent_account_id
-        self.state: AccountState = ActiveState()
+        self.state: AccountState = ACTIVE
         self.created_at = datetime.now()
         self.is_closed = False
     
@@ -38,7 +39,8 @@ class Account:
             return False
         if amount <= 0:
             return False
-        self.balance += amount
+        # Add in integer cents so repeated updates do not accumulate float error
+        self.balance = from_cents(to_cents(self.balance) + to_cents(amount))
         return True
     
     def withdraw(self, amount: float) -> bool:
@@ -54,9 +56,11 @@ class Account:
             return False
         if amount <= 0:
             return False
-        if self.balance < amount:
+        balance_cents = to_cents(self.balance)
+        amount_cents = to_cents(amount)
+        if balance_cents < amount_cents:
             raise InsufficientFundsError(f"Insufficient funds. Balance: ${self.balance:.2f}, Requested: ${amount:.2f}")
-        self.balance -= amount
+        self.balance = from_cents(balance_cents - amount_cents)
         return True
     
     def transfer(self, amount: float) -> bool:
@@ -72,7 +76,7 @@ class Account:
             return False
         if amount <= 0:
             return False
-        if self.balance < amount:
+        if to_cents(self.balance) < to_cents(amount):
             raise InsufficientFundsError(f"Insufficient funds for transfer")
         return True
     
@@ -82,8 +86,8 @@ class Account:
     
     def close(self):
         """Close the account"""
-        from patterns.state.account_state import ClosedState
-        self.set_state(ClosedState())
+        from patterns.state.account_state import CLOSED
+        self.set_state(CLOSED)
         self.is_closed = True
     
     def to_dict(self) -> dict:
@@ -3,7 +3,8 @@ Transaction domain model
 """
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from functools import cached_property
+from typing import Optional, List, Dict, Any
 
 
 class TransactionType(Enum):
@@ -39,6 +40,11 @@ class Transaction:
         self.approved_by: Optional[str] = None
         self.approved_at: Optional[datetime] = None
     
+    @cached_property
+    def type_value(self) -> str:
+        """Transaction type as its string value, cached for repeated report lookups"""
+        return self.transaction_type.value
+    
     def approve(self, approver: str):
         """Approve the transaction"""
         self.status = TransactionStatus.APPROVED
@@ -67,4 +73,39 @@ class Transaction:
             'approved_by': self.approved_by,
             'approved_at': self.approved_at.isoformat() if self.approved_at else None
         }
-
+    
+    @staticmethod
+    def columns_to_arrays(transactions: List['Transaction']) -> Dict[str, List[Any]]:
+        """
+        Convert transactions to a column-oriented dictionary (one list per field)
+        in a single pass, avoiding a dict allocation per transaction
+        """
+        columns = {
+            'transaction_id': [], 'transaction_type': [], 'account_id': [],
+            'target_account_id': [], 'amount': [], 'status': [], 'description': [],
+            'created_at': [], 'approved_by': [], 'approved_at': []
+        }
+        transaction_ids = columns['transaction_id'].append
+        types = columns['transaction_type'].append
+        account_ids = columns['account_id'].append
+        target_account_ids = columns['target_account_id'].append
+        amounts = columns['amount'].append
+        statuses = columns['status'].append
+        descriptions = columns['description'].append
+        created = columns['created_at'].append
+        approvers = columns['approved_by'].append
+        approved = columns['approved_at'].append
+        
+        for t in transactions:
+            transaction_ids(t.transaction_id)
+            types(t.transaction_type.value)
+            account_ids(t.account_id)
+            target_account_ids(t.target_account_id)
+            amounts(t.amount)
+            statuses(t.status.value)
+            descriptions(t.description)
+            created(t.created_at.isoformat())
+            approvers(t.approved_by)
+            approved(t.approved_at.isoformat() if t.approved_at else None)
+        
+        return columns
@@ -2,7 +2,7 @@
 Database-enabled Banking Facade
 Uses PostgreSQL database for persistent storage
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from domain.account.account import Account
 from domain.account.account_type import AccountType
 from domain.transaction.transaction import Transaction, TransactionType, TransactionStatus
@@ -12,23 +12,62 @@ from patterns.observer.observer import Subject, EventType
 from patterns.chain.approval_handler import ApprovalChain
 from database.repository import AccountRepository, TransactionRepository, FinancialsRepository
 from database.models import AccountStateEnum, TransactionStatusEnum
+from database.db import (
+    db, end_read_only_transaction, set_transaction_isolation, retry_on_serialization_failure
+)
+from config import AUTO_APPROVE_THRESHOLD, EMPLOYEE_APPROVE_THRESHOLD
 from utils.exceptions import (
     InvalidTransactionError, UnauthorizedAccessError, 
     AccountNotFoundError, InsufficientFundsError, FrozenAccountError
 )
+from contextlib import contextmanager
 from datetime import datetime
+from functools import wraps
+import threading
 import uuid
 
 
+def _changes_transactions(method):
+    """Bump the facade's transaction version once a transaction-writing method returns or fails"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            with self._transactions_version_lock:
+                self._transactions_version += 1
+    return wrapper
+
+
 class BankingFacadeDB(Subject):
     """
     Database-enabled Facade providing unified interface for all banking operations
     Uses PostgreSQL for persistent storage
     """
     
+    _STATE_MAP = {
+        'active': AccountStateEnum.ACTIVE,
+        'frozen': AccountStateEnum.FROZEN,
+        'suspended': AccountStateEnum.SUSPENDED,
+        'closed': AccountStateEnum.CLOSED
+    }
+    
     def __init__(self):
         super().__init__()
         self.approval_chain = ApprovalChain.create_chain()
+        self._transactions_version = 0
+        self._transactions_version_lock = threading.Lock()
+        # Accounts already loaded by the operation running on this thread (see account_cache)
+        self._account_cache = threading.local()
+    
+    @property
+    def transactions_version(self) -> int:
+        """
+        Counter that changes whenever this process creates transactions or changes
+        their status. Writes by other processes are not seen; caches keyed on it
+        also need a TTL.
+        """
+        return self._transactions_version
     
     # Account Management
     def create_account(self, account_type: AccountType, owner_id: str, 
@@ -45,20 +84,45 @@ class BankingFacadeDB(Subject):
         # Convert to domain object
         account = AccountRepository.to_domain_account(db_account)
         
-        self.notifyObserver(EventType.ACCOUNT_STATE_CHANGED, {
-            'account_id': account_id,
-            'state': account.get_state_name(),
-            'message': f"Account {account_id} created",
-            'timestamp': datetime.now().isoformat()
-        })
+        if self._observers:
+            self.notifyObserver(EventType.ACCOUNT_STATE_CHANGED, {
+                'account_id': account_id,
+                'state': account.get_state_name(),
+                'message': f"Account {account_id} created",
+                'timestamp': datetime.now().isoformat()
+            })
         
         return account
     
     def get_account(self, account_id: str) -> Account:
         """Get account by ID"""
+        cache = getattr(self._account_cache, 'accounts', None)
+        if cache is not None:
+            account = cache.get(account_id)
+            if account is None:
+                account = cache[account_id] = AccountRepository.to_domain_account(
+                    AccountRepository.get(account_id)
+                )
+            return account
         db_account = AccountRepository.get(account_id)
         return AccountRepository.to_domain_account(db_account)
     
+    @contextmanager
+    def account_cache(self):
+        """
+        Reuse accounts loaded by get_account on this thread until the block exits,
+        so an operation that looks the same account up several times loads it once.
+        Nested blocks share the outermost cache.
+        """
+        if getattr(self._account_cache, 'accounts', None) is not None:
+            yield
+            return
+        self._account_cache.accounts = {}
+        try:
+            yield
+        finally:
+            self._account_cache.accounts = None
+    
     def get_accounts_by_owner(self, owner_id: str) -> List[Account]:
         """Get all accounts for an owner"""
         db_accounts = AccountRepository.get_by_owner(owner_id)
@@ -69,6 +133,10 @@ class BankingFacadeDB(Subject):
         db_accounts = AccountRepository.get_all()
         return [AccountRepository.to_domain_account(acc) for acc in db_accounts]
     
+    def get_account_totals(self) -> Dict[str, Any]:
+        """Get bank-wide balance totals and account counts"""
+        return AccountRepository.financial_summary()
+    
     def change_account_state(self, account_id: str, state_name: str, user_role: Role):
         """Change account state (requires appropriate role)"""
         if user_role not in [Role.EMPLOYEE, Role.ADMIN]:
@@ -76,31 +144,26 @@ class BankingFacadeDB(Subject):
         
         account = self.get_account(account_id)
         
-        state_map = {
-            'active': AccountStateEnum.ACTIVE,
-            'frozen': AccountStateEnum.FROZEN,
-            'suspended': AccountStateEnum.SUSPENDED,
-            'closed': AccountStateEnum.CLOSED
-        }
-        
-        if state_name.lower() not in state_map:
+        state = self._STATE_MAP.get(state_name.lower())
+        if state is None:
             raise InvalidTransactionError(f"Invalid state: {state_name}")
         
         # Update in database
-        AccountRepository.update_state(account_id, state_map[state_name.lower()])
-        
-        # Reload account to get updated state
-        account = self.get_account(account_id)
-        
-        self.notifyObserver(EventType.ACCOUNT_STATE_CHANGED, {
-            'account_id': account_id,
-            'state': account.get_state_name(),
-            'changed_by': user_role.value,
-            'message': f"Account {account_id} state changed to {state_name}",
-            'timestamp': datetime.now().isoformat()
-        })
+        AccountRepository.update_state(account_id, state)
+        
+        if self._observers:
+            # Reload account to get updated state
+            account = self.get_account(account_id)
+            self.notifyObserver(EventType.ACCOUNT_STATE_CHANGED, {
+                'account_id': account_id,
+                'state': account.get_state_name(),
+                'changed_by': user_role.value,
+                'message': f"Account {account_id} state changed to {state_name}",
+                'timestamp': datetime.now().isoformat()
+            })
     
     # Transaction Operations
+    @_changes_transactions
     def deposit(self, account_id: str, amount: float, description: str = "",
                user_role: Role = Role.CUSTOMER, user_id: str = None) -> Transaction:
         """
@@ -114,26 +177,26 @@ class BankingFacadeDB(Subject):
         
         transaction_id = f"TXN_{uuid.uuid4().hex[:8].upper()}"
         
-        # Create transaction in database
-        db_transaction = TransactionRepository.create(
-            transaction_id, TransactionType.DEPOSIT, account_id, amount, 
+        transaction = Transaction(
+            transaction_id, TransactionType.DEPOSIT, account_id, amount,
             description=description
         )
-        transaction = TransactionRepository.to_domain_transaction(db_transaction)
         
-        # Process through approval chain
+        # Process through approval chain before persisting, so the row is
+        # inserted once with its final status instead of inserted then updated
         approved = self.approval_chain.handle(transaction, user_role)
         
-        if approved:
-            if account.deposit(amount):
-                # Update account balance in database
-                AccountRepository.update_balance(account_id, account.balance)
-                # Update transaction status to COMPLETED after execution
-                TransactionRepository.update_status(
-                    transaction_id, TransactionStatusEnum.COMPLETED, "System"
-                )
-                transaction.complete()
-                
+        if approved and account.deposit(amount):
+            # Update account balance in database
+            AccountRepository.update_balance(account_id, account.balance)
+            TransactionRepository.create(
+                transaction_id, TransactionType.DEPOSIT, account_id, amount,
+                description=description,
+                status=TransactionStatusEnum.COMPLETED, approved_by="System"
+            )
+            transaction.complete()
+            
+            if self._observers:
                 self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
                     'transaction_id': transaction_id,
                     'account_id': account_id,
@@ -148,9 +211,15 @@ class BankingFacadeDB(Subject):
                     'message': f"Balance updated to ${account.balance:.2f}",
                     'timestamp': datetime.now().isoformat()
                 })
+        else:
+            TransactionRepository.create(
+                transaction_id, TransactionType.DEPOSIT, account_id, amount,
+                description=description
+            )
         
         return transaction
     
+    @_changes_transactions
     def withdraw(self, account_id: str, amount: float, description: str = "",
                 user_role: Role = Role.CUSTOMER, user_id: str = None,
                 authenticated_account_id: str = None) -> Transaction:
@@ -163,21 +232,7 @@ class BankingFacadeDB(Subject):
         """
         account = self.get_account(account_id)
         
-        # Account-based authentication (account_id + IBAN)
-        if authenticated_account_id:
-            if account_id != authenticated_account_id:
-                raise UnauthorizedAccessError(
-                    f"Security violation: You can only withdraw from the account you authenticated with. "
-                    f"Authenticated: {authenticated_account_id}, Requested: {account_id}"
-                )
-        # User-based authentication (legacy)
-        elif user_role == Role.CUSTOMER:
-            current_user_id = user_id or getattr(self, '_current_user_id', None)
-            if account.owner_id != current_user_id:
-                raise UnauthorizedAccessError(
-                    f"Security violation: Customers can only withdraw from their own accounts. "
-                    f"Account {account_id} belongs to {account.owner_id}, not {current_user_id}"
-                )
+        self._check_debit_access(account, "withdraw", user_role, user_id, authenticated_account_id)
         
         # Balance verification is done in account.withdraw() which raises InsufficientFundsError
         
@@ -201,20 +256,21 @@ class BankingFacadeDB(Subject):
                     # Transaction is already approved by approval chain
                     # Status remains APPROVED after execution
                     
-                    self.notifyObserver(EventType.TRANSACTION_APPROVED, {
-                        'transaction_id': transaction_id,
-                        'account_id': account_id,
-                        'amount': amount,
-                        'type': 'withdrawal',
-                        'message': f"Withdrawal of ${amount:.2f} approved and executed",
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    self.notifyObserver(EventType.BALANCE_CHANGED, {
-                        'account_id': account_id,
-                        'new_balance': account.balance,
-                        'message': f"Balance updated to ${account.balance:.2f}",
-                        'timestamp': datetime.now().isoformat()
-                    })
+                    if self._observers:
+                        self.notifyObserver(EventType.TRANSACTION_APPROVED, {
+                            'transaction_id': transaction_id,
+                            'account_id': account_id,
+                            'amount': amount,
+                            'type': 'withdrawal',
+                            'message': f"Withdrawal of ${amount:.2f} approved and executed",
+                            'timestamp': datetime.now().isoformat()
+                        })
+                        self.notifyObserver(EventType.BALANCE_CHANGED, {
+                            'account_id': account_id,
+                            'new_balance': account.balance,
+                            'message': f"Balance updated to ${account.balance:.2f}",
+                            'timestamp': datetime.now().isoformat()
+                        })
             except (InsufficientFundsError, FrozenAccountError) as e:
                 TransactionRepository.update_status(transaction_id, TransactionStatusEnum.REJECTED)
                 transaction.reject()
@@ -222,6 +278,7 @@ class BankingFacadeDB(Subject):
         
         return transaction
     
+    @_changes_transactions
     def transfer(self, from_account_id: str, to_account_id: str, 
                 amount: float, description: str = "",
                 user_role: Role = Role.CUSTOMER, user_id: str = None,
@@ -233,6 +290,15 @@ class BankingFacadeDB(Subject):
         Employees and admins can transfer from any account to any account.
         Transfer is atomic - both accounts are updated together or not at all.
         """
+        # Auto-approved transfers are validated and applied in a single statement
+        if 0 < amount <= AUTO_APPROVE_THRESHOLD:
+            transaction = self._transfer_fast(
+                from_account_id, to_account_id, amount, description,
+                user_role, user_id, authenticated_account_id
+            )
+            if transaction is not None:
+                return transaction
+        
         from_account = self.get_account(from_account_id)
         to_account = self.get_account(to_account_id)
         
@@ -242,21 +308,7 @@ class BankingFacadeDB(Subject):
         if not to_account:
             raise AccountNotFoundError(f"Destination account {to_account_id} not found")
         
-        # Account-based authentication (account_id + IBAN)
-        if authenticated_account_id:
-            if from_account_id != authenticated_account_id:
-                raise UnauthorizedAccessError(
-                    f"Security violation: You can only transfer from the account you authenticated with. "
-                    f"Authenticated: {authenticated_account_id}, Requested: {from_account_id}"
-                )
-        # User-based authentication (legacy)
-        elif user_role == Role.CUSTOMER:
-            current_user_id = user_id or getattr(self, '_current_user_id', None)
-            if from_account.owner_id != current_user_id:
-                raise UnauthorizedAccessError(
-                    f"Security violation: Customers can only transfer from their own accounts. "
-                    f"Account {from_account_id} belongs to {from_account.owner_id}, not {current_user_id}"
-                )
+        self._check_debit_access(from_account, "transfer", user_role, user_id, authenticated_account_id)
         
         # Verify sufficient balance in source account (done in account.transfer())
         # This will raise InsufficientFundsError if balance is insufficient
@@ -275,7 +327,6 @@ class BankingFacadeDB(Subject):
         
         if approved:
             # Use database transaction for atomicity
-            from database.db import db
             try:
                 # Verify transfer is allowed (checks balance)
                 if not from_account.transfer(amount):
@@ -298,27 +349,28 @@ class BankingFacadeDB(Subject):
                 # Commit all changes atomically
                 db.session.commit()
                 
-                self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
-                    'transaction_id': transaction_id,
-                    'account_id': from_account_id,
-                    'target_account_id': to_account_id,
-                    'amount': amount,
-                    'type': 'transfer',
-                    'message': f"Transfer of ${amount:.2f} completed",
-                    'timestamp': datetime.now().isoformat()
-                })
-                self.notifyObserver(EventType.BALANCE_CHANGED, {
-                    'account_id': from_account_id,
-                    'new_balance': from_account.balance,
-                    'message': f"Balance updated to ${from_account.balance:.2f}",
-                    'timestamp': datetime.now().isoformat()
-                })
-                self.notifyObserver(EventType.BALANCE_CHANGED, {
-                    'account_id': to_account_id,
-                    'new_balance': to_account.balance,
-                    'message': f"Balance updated to ${to_account.balance:.2f}",
-                    'timestamp': datetime.now().isoformat()
-                })
+                if self._observers:
+                    self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
+                        'transaction_id': transaction_id,
+                        'account_id': from_account_id,
+                        'target_account_id': to_account_id,
+                        'amount': amount,
+                        'type': 'transfer',
+                        'message': f"Transfer of ${amount:.2f} completed",
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    self.notifyObserver(EventType.BALANCE_CHANGED, {
+                        'account_id': from_account_id,
+                        'new_balance': from_account.balance,
+                        'message': f"Balance updated to ${from_account.balance:.2f}",
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    self.notifyObserver(EventType.BALANCE_CHANGED, {
+                        'account_id': to_account_id,
+                        'new_balance': to_account.balance,
+                        'message': f"Balance updated to ${to_account.balance:.2f}",
+                        'timestamp': datetime.now().isoformat()
+                    })
             except (InsufficientFundsError, AccountNotFoundError, FrozenAccountError) as e:
                 # Rollback database changes on error for atomicity
                 db.session.rollback()
@@ -334,8 +386,275 @@ class BankingFacadeDB(Subject):
         
         return transaction
     
+    @retry_on_serialization_failure()
+    def _transfer_fast(self, from_account_id: str, to_account_id: str,
+                       amount: float, description: str, user_role: Role,
+                       user_id: Optional[str],
+                       authenticated_account_id: Optional[str]) -> Optional[Transaction]:
+        """
+        Fast path for auto-approved transfers.
+        Balance, state and ownership are checked by the guarded UPDATE itself, so
+        the accounts are never loaded. Returns None when the guard rejects the
+        transfer; the caller then takes the full path, which raises the precise error.
+        Runs under SERIALIZABLE to rule out write skew between concurrent transfers;
+        reads elsewhere stay at the default READ COMMITTED level.
+        """
+        owner_id = None
+        if authenticated_account_id:
+            if from_account_id != authenticated_account_id:
+                return None
+        elif user_role == Role.CUSTOMER:
+            owner_id = user_id or getattr(self, '_current_user_id', None)
+            if owner_id is None:
+                return None
+        
+        self._begin_serializable()
+        balances = AccountRepository.transfer_balance(
+            from_account_id, to_account_id, amount, owner_id=owner_id
+        )
+        if balances is None:
+            # Undo a possible one-sided update; this unit of work began in _begin_serializable
+            db.session.rollback()
+            return None
+        
+        transaction_id = f"TXN_{uuid.uuid4().hex[:8].upper()}"
+        
+        # Persisting the transaction row commits the balance update with it
+        TransactionRepository.create(
+            transaction_id, TransactionType.TRANSFER, from_account_id, amount,
+            target_account_id=to_account_id, description=description,
+            status=TransactionStatusEnum.COMPLETED, approved_by="System"
+        )
+        transaction = Transaction(
+            transaction_id, TransactionType.TRANSFER, from_account_id, amount,
+            target_account_id=to_account_id, description=description
+        )
+        self.approval_chain.handle(transaction, user_role)
+        transaction.complete()
+        
+        if self._observers:
+            self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
+                'transaction_id': transaction_id,
+                'account_id': from_account_id,
+                'target_account_id': to_account_id,
+                'amount': amount,
+                'type': 'transfer',
+                'message': f"Transfer of ${amount:.2f} completed",
+                'timestamp': datetime.now().isoformat()
+            })
+            for account_id in (from_account_id, to_account_id):
+                self.notifyObserver(EventType.BALANCE_CHANGED, {
+                    'account_id': account_id,
+                    'new_balance': balances[account_id],
+                    'message': f"Balance updated to ${balances[account_id]:.2f}",
+                    'timestamp': datetime.now().isoformat()
+                })
+        
+        return transaction
+    
+    # Batch Transaction Operations
+    @_changes_transactions
+    def deposit_many(self, deposits: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                     user_id: str = None) -> List[Transaction]:
+        """
+        Deposit into several accounts in one database transaction.
+        Each item takes deposit()'s arguments as keys: account_id, amount, description (optional).
+        """
+        return self._submit_batch(TransactionType.DEPOSIT, deposits, user_role, user_id, None)
+    
+    @_changes_transactions
+    def withdraw_many(self, withdrawals: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                      user_id: str = None, authenticated_account_id: str = None) -> List[Transaction]:
+        """
+        Withdraw from several accounts in one database transaction.
+        Each item takes withdraw()'s arguments as keys: account_id, amount, description (optional).
+        """
+        return self._submit_batch(TransactionType.WITHDRAWAL, withdrawals, user_role, user_id,
+                                  authenticated_account_id)
+    
+    @_changes_transactions
+    def transfer_many(self, transfers: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                      user_id: str = None, authenticated_account_id: str = None) -> List[Transaction]:
+        """
+        Perform several transfers in one database transaction.
+        Each item takes transfer()'s arguments as keys: from_account_id, to_account_id, amount,
+        description (optional).
+        """
+        return self._submit_batch(TransactionType.TRANSFER, transfers, user_role, user_id,
+                                  authenticated_account_id)
+    
+    @retry_on_serialization_failure()
+    def _submit_batch(self, transaction_type: TransactionType, items: List[Dict[str, Any]],
+                      user_role: Role, user_id: Optional[str],
+                      authenticated_account_id: Optional[str]) -> List[Transaction]:
+        """
+        Shared all-or-nothing batch path.
+        All accounts are loaded in one query and updated in memory in submission order,
+        so later items see the balances left by earlier ones. Any error aborts the whole
+        batch; otherwise the transaction rows (one COPY) and the final balances (one UPDATE)
+        are written and committed once. Items the approval chain does not approve are
+        recorded as pending, exactly like the single-item methods.
+        """
+        if not items:
+            return []
+        
+        self._begin_serializable()
+        try:
+            account_ids = set()
+            for item in items:
+                account_ids.add(item.get('from_account_id') or item['account_id'])
+                if item.get('to_account_id'):
+                    account_ids.add(item['to_account_id'])
+            db_accounts = AccountRepository.get_many(account_ids)
+            for account_id in account_ids - db_accounts.keys():
+                raise AccountNotFoundError(f"Account {account_id} not found")
+            accounts = {
+                account_id: AccountRepository.to_domain_account(db_account)
+                for account_id, db_account in db_accounts.items()
+            }
+            
+            transactions = []
+            rows = []
+            changed_accounts = set()
+            for item in items:
+                source_id = item.get('from_account_id') or item['account_id']
+                target_id = item.get('to_account_id')
+                amount = item['amount']
+                description = item.get('description', "")
+                source = accounts[source_id]
+                
+                if transaction_type == TransactionType.WITHDRAWAL:
+                    self._check_debit_access(source, "withdraw", user_role, user_id, authenticated_account_id)
+                elif transaction_type == TransactionType.TRANSFER:
+                    self._check_debit_access(source, "transfer", user_role, user_id, authenticated_account_id)
+                
+                transaction = Transaction(
+                    f"TXN_{uuid.uuid4().hex[:8].upper()}", transaction_type, source_id, amount,
+                    target_account_id=target_id, description=description
+                )
+                
+                executed = False
+                if self.approval_chain.handle(transaction, user_role):
+                    if transaction_type == TransactionType.DEPOSIT:
+                        executed = source.deposit(amount)
+                    elif transaction_type == TransactionType.WITHDRAWAL:
+                        executed = source.withdraw(amount)
+                    else:
+                        if not source.transfer(amount):
+                            raise InsufficientFundsError("Transfer validation failed")
+                        source.withdraw(amount)
+                        if not accounts[target_id].deposit(amount):
+                            raise InvalidTransactionError(f"Account {target_id} cannot receive transfers")
+                        executed = True
+                
+                if executed:
+                    transaction.complete()
+                    changed_accounts.add(source_id)
+                    if target_id:
+                        changed_accounts.add(target_id)
+                
+                rows.append({
+                    'transaction_id': transaction.transaction_id,
+                    'transaction_type': transaction_type,
+                    'account_id': source_id,
+                    'target_account_id': target_id,
+                    'amount': amount,
+                    'description': description,
+                    'status': TransactionStatusEnum.COMPLETED if executed else TransactionStatusEnum.PENDING,
+                    'approved_by': "System" if executed else None
+                })
+                transactions.append(transaction)
+            
+            TransactionRepository.bulk_create(rows, commit=False)
+            AccountRepository.update_balances_batch(
+                [(account_id, accounts[account_id].balance) for account_id in changed_accounts],
+                commit=False
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        if self._observers:
+            for transaction in transactions:
+                if transaction.status == TransactionStatus.COMPLETED:
+                    self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
+                        'transaction_id': transaction.transaction_id,
+                        'account_id': transaction.account_id,
+                        'target_account_id': transaction.target_account_id,
+                        'amount': transaction.amount,
+                        'type': transaction.type_value,
+                        'message': f"{transaction.type_value.title()} of ${transaction.amount:.2f} completed",
+                        'timestamp': datetime.now().isoformat()
+                    })
+            # One balance event per account with its final balance
+            for account_id in changed_accounts:
+                balance = accounts[account_id].balance
+                self.notifyObserver(EventType.BALANCE_CHANGED, {
+                    'account_id': account_id,
+                    'new_balance': balance,
+                    'message': f"Balance updated to ${balance:.2f}",
+                    'timestamp': datetime.now().isoformat()
+                })
+        
+        return transactions
+    
+    @staticmethod
+    def _begin_serializable():
+        """
+        Start a SERIALIZABLE unit of work. A transaction left open by earlier reads
+        is closed first; one holding uncommitted writes raises RuntimeError instead
+        of being committed or discarded behind the caller's back.
+        """
+        end_read_only_transaction()
+        set_transaction_isolation('SERIALIZABLE')
+    
+    def _check_debit_access(self, account: Account, action: str, user_role: Role,
+                            user_id: Optional[str], authenticated_account_id: Optional[str]):
+        """Raise UnauthorizedAccessError unless the caller may move money out of account"""
+        # Account-based authentication (account_id + IBAN)
+        if authenticated_account_id:
+            if account.account_id != authenticated_account_id:
+                raise UnauthorizedAccessError(
+                    f"Security violation: You can only {action} from the account you authenticated with. "
+                    f"Authenticated: {authenticated_account_id}, Requested: {account.account_id}"
+                )
+        # User-based authentication (legacy)
+        elif user_role == Role.CUSTOMER:
+            current_user_id = user_id or getattr(self, '_current_user_id', None)
+            if account.owner_id != current_user_id:
+                raise UnauthorizedAccessError(
+                    f"Security violation: Customers can only {action} from their own accounts. "
+                    f"Account {account.account_id} belongs to {account.owner_id}, not {current_user_id}"
+                )
+    
+    def _execute_transaction(self, transaction: Transaction, account: Account):
+        """Apply a transaction to its account(s) and persist the new balances in one statement"""
+        if transaction.transaction_type == TransactionType.DEPOSIT:
+            account.deposit(transaction.amount)
+            balances = [(account.account_id, account.balance)]
+        elif transaction.transaction_type == TransactionType.WITHDRAWAL:
+            account.withdraw(transaction.amount)
+            balances = [(account.account_id, account.balance)]
+        elif transaction.transaction_type == TransactionType.TRANSFER:
+            target_account = self.get_account(transaction.target_account_id)
+            account.withdraw(transaction.amount)
+            target_account.deposit(transaction.amount)
+            balances = [
+                (account.account_id, account.balance),
+                (target_account.account_id, target_account.balance)
+            ]
+        else:
+            return
+        
+        AccountRepository.update_balances_batch(balances)
+    
+    @_changes_transactions
     def approve_transaction(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
         """Manually approve a pending transaction"""
+        if self._approve_fast(transaction_id, approver_role, approver_id):
+            return True
+        
         db_transaction = TransactionRepository.get(transaction_id)
         if not db_transaction:
             raise InvalidTransactionError(f"Transaction {transaction_id} not found")
@@ -355,18 +674,7 @@ class BankingFacadeDB(Subject):
         account = self.get_account(transaction.account_id)
         
         try:
-            if transaction.transaction_type == TransactionType.DEPOSIT:
-                account.deposit(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-            elif transaction.transaction_type == TransactionType.WITHDRAWAL:
-                account.withdraw(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-            elif transaction.transaction_type == TransactionType.TRANSFER:
-                target_account = self.get_account(transaction.target_account_id)
-                account.withdraw(transaction.amount)
-                target_account.deposit(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-                AccountRepository.update_balance(transaction.target_account_id, target_account.balance)
+            self._execute_transaction(transaction, account)
             
             # Update transaction status in database to APPROVED first
             TransactionRepository.update_status(
@@ -385,15 +693,51 @@ class BankingFacadeDB(Subject):
             transaction.reject()
             raise
         
-        self.notifyObserver(EventType.TRANSACTION_APPROVED, {
-            'transaction_id': transaction_id,
-            'approver': approver_id,
-            'message': f"Transaction {transaction_id} approved by {approver_id}",
-            'timestamp': datetime.now().isoformat()
-        })
+        if self._observers:
+            self.notifyObserver(EventType.TRANSACTION_APPROVED, {
+                'transaction_id': transaction_id,
+                'approver': approver_id,
+                'message': f"Transaction {transaction_id} approved by {approver_id}",
+                'timestamp': datetime.now().isoformat()
+            })
         
         return True
     
+    @retry_on_serialization_failure()
+    def _approve_fast(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
+        """
+        Fast path for approvals: status change and balance update in a single statement.
+        Returns False when the guard rejects the approval (unknown or non-pending
+        transaction, amount above the approver's limit, insufficient funds, account
+        state); the caller then takes the full path, which raises the precise error
+        or records the rejection.
+        """
+        if approver_role == Role.ADMIN:
+            max_amount = None
+        elif approver_role == Role.EMPLOYEE:
+            max_amount = EMPLOYEE_APPROVE_THRESHOLD
+        else:
+            max_amount = AUTO_APPROVE_THRESHOLD
+        
+        self._begin_serializable()
+        balances = TransactionRepository.approve_pending(transaction_id, approver_id, max_amount)
+        if balances is None:
+            # End the SERIALIZABLE transaction so the full path runs at the default level
+            db.session.rollback()
+            return False
+        db.session.commit()
+        
+        if self._observers:
+            self.notifyObserver(EventType.TRANSACTION_APPROVED, {
+                'transaction_id': transaction_id,
+                'approver': approver_id,
+                'message': f"Transaction {transaction_id} approved by {approver_id}",
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        return True
+    
+    @_changes_transactions
     def complete_transaction(self, transaction_id: str, executor_role: Role, executor_id: str) -> bool:
         """Execute an approved transaction and mark it as completed"""
         db_transaction = TransactionRepository.get(transaction_id)
@@ -409,18 +753,7 @@ class BankingFacadeDB(Subject):
         account = self.get_account(transaction.account_id)
         
         try:
-            if transaction.transaction_type == TransactionType.DEPOSIT:
-                account.deposit(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-            elif transaction.transaction_type == TransactionType.WITHDRAWAL:
-                account.withdraw(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-            elif transaction.transaction_type == TransactionType.TRANSFER:
-                target_account = self.get_account(transaction.target_account_id)
-                account.withdraw(transaction.amount)
-                target_account.deposit(transaction.amount)
-                AccountRepository.update_balance(transaction.account_id, account.balance)
-                AccountRepository.update_balance(transaction.target_account_id, target_account.balance)
+            self._execute_transaction(transaction, account)
             
             # Update transaction status to COMPLETED after execution
             TransactionRepository.update_status(
@@ -428,18 +761,20 @@ class BankingFacadeDB(Subject):
             )
             transaction.complete()
             
-            self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
-                'transaction_id': transaction_id,
-                'executor': executor_id,
-                'message': f"Transaction {transaction_id} executed and completed by {executor_id}",
-                'timestamp': datetime.now().isoformat()
-            })
+            if self._observers:
+                self.notifyObserver(EventType.TRANSACTION_COMPLETED, {
+                    'transaction_id': transaction_id,
+                    'executor': executor_id,
+                    'message': f"Transaction {transaction_id} executed and completed by {executor_id}",
+                    'timestamp': datetime.now().isoformat()
+                })
             
             return True
         except (InsufficientFundsError, FrozenAccountError, AccountNotFoundError) as e:
             # If execution fails, keep transaction in APPROVED status
             raise
     
+    @_changes_transactions
     def deny_transaction(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
         """Manually deny/reject a pending transaction"""
         db_transaction = TransactionRepository.get(transaction_id)
@@ -463,31 +798,65 @@ class BankingFacadeDB(Subject):
         )
         transaction.reject()
         
-        self.notifyObserver(EventType.TRANSACTION_APPROVED, {
-            'transaction_id': transaction_id,
-            'approver': approver_id,
-            'message': f"Transaction {transaction_id} denied by {approver_id}",
-            'timestamp': datetime.now().isoformat()
-        })
+        if self._observers:
+            self.notifyObserver(EventType.TRANSACTION_APPROVED, {
+                'transaction_id': transaction_id,
+                'approver': approver_id,
+                'message': f"Transaction {transaction_id} denied by {approver_id}",
+                'timestamp': datetime.now().isoformat()
+            })
         
         return True
     
     # Reporting
-    def get_pending_transactions(self) -> List[Transaction]:
-        """Get all pending transactions"""
-        db_transactions = TransactionRepository.get_pending()
+    @_changes_transactions
+    def bulk_create_transactions(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Record many transactions in one round trip (batch postings, reconciliation imports).
+        Rows are stored as given; balances are not touched and no observers are notified.
+        """
+        return TransactionRepository.bulk_create(rows)
+    
+    def get_pending_transactions(self, max_amount: Optional[float] = None,
+                                 limit: Optional[int] = None, offset: int = 0) -> List[Transaction]:
+        """Get pending transactions, optionally only those up to max_amount and one page of them"""
+        db_transactions = TransactionRepository.get_pending(max_amount, limit, offset)
+        return [TransactionRepository.to_domain_transaction(t) for t in db_transactions]
+    
+    def get_transactions_by_account(self, account_id: str, limit: Optional[int] = None,
+                                    offset: int = 0) -> List[Transaction]:
+        """Get all transactions for an account, or one page of them"""
+        db_transactions = TransactionRepository.get_by_account(account_id, limit, offset)
         return [TransactionRepository.to_domain_transaction(t) for t in db_transactions]
     
-    def get_transactions_by_account(self, account_id: str) -> List[Transaction]:
-        """Get all transactions for an account"""
-        db_transactions = TransactionRepository.get_by_account(account_id)
+    def get_recent_transactions_by_account(self, account_id: str, limit: int = 10) -> List[Transaction]:
+        """Get the most recent transactions for an account, oldest first"""
+        db_transactions = TransactionRepository.get_recent_by_account(account_id, limit)
         return [TransactionRepository.to_domain_transaction(t) for t in db_transactions]
     
+    def count_transactions_by_account(self, account_id: str) -> int:
+        """Count transactions for an account"""
+        return TransactionRepository.count_by_account(account_id)
+    
     def get_all_transactions(self) -> List[Transaction]:
         """Get all transactions"""
         db_transactions = TransactionRepository.get_all()
         return [TransactionRepository.to_domain_transaction(t) for t in db_transactions]
     
+    def iter_all_transactions(self, batch_size: int = 10_000) -> Iterator[Transaction]:
+        """Iterate over all transactions without loading them all at once"""
+        for t in TransactionRepository.iter_all(batch_size):
+            yield TransactionRepository.to_domain_transaction(t)
+    
+    def get_transactions_between(self, start: datetime, end: datetime) -> List[Transaction]:
+        """Get transactions created in [start, end)"""
+        db_transactions = TransactionRepository.get_between(start, end)
+        return [TransactionRepository.to_domain_transaction(t) for t in db_transactions]
+    
+    def get_transaction_totals_between(self, start: datetime, end: datetime) -> Dict[str, float]:
+        """Get summed amounts per transaction type for [start, end)"""
+        return TransactionRepository.get_totals_between(start, end)
+    
     # Bank financials
     def update_retained_earnings(self, net_income: float, dividends: float):
         """Update bank's retained earnings"""
@@ -2,6 +2,7 @@
 Observer Pattern for notifications and event handling
 """
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from typing import List, Dict, Any
 from enum import Enum
 
@@ -42,6 +43,8 @@ class Subject(ABC):
     
     def notifyObserver(self, event_type: EventType, data: Dict[str, Any]):
         """Notify all observers"""
+        if not self._observers:
+            return
         for observer in self._observers:
             observer.update(event_type, data)
 
@@ -51,22 +54,27 @@ class NotificationObserver(Observer):
     
     def __init__(self):
         self.notifications: List[Dict[str, Any]] = []
+        # Same notifications indexed by the user they belong to
+        self._by_user: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
     
     def update(self, event_type: EventType, data: Dict[str, Any]):
         """Handle notification event"""
+        # Keep the EventType member; it is only stringified when displayed
         notification = {
-            'event_type': event_type.value,
+            'event_type': event_type,
             'data': data,
             'timestamp': data.get('timestamp')
         }
         self.notifications.append(notification)
+        user_id = data.get('user_id')
+        if user_id is not None:
+            self._by_user[user_id].append(notification)
         print(f"📧 Notification: {event_type.value} - {data.get('message', '')}")
     
     def get_notifications(self, user_id: str = None) -> List[Dict[str, Any]]:
         """Get notifications, optionally filtered by user"""
         if user_id:
-            return [n for n in self.notifications 
-                   if n['data'].get('user_id') == user_id]
+            return list(self._by_user.get(user_id, ()))
         return self.notifications
 
 
@@ -79,13 +87,13 @@ class AuditLogObserver(Observer):
     def update(self, event_type: EventType, data: Dict[str, Any]):
         """Log event for audit"""
         log_entry = {
-            'event_type': event_type.value,
+            'event_type': event_type,
             'data': data,
             'timestamp': data.get('timestamp')
         }
         self.audit_logs.append(log_entry)
         from utils.logger import logger
-        logger.info(f"Audit: {event_type.value} - {data}")
+        logger.info("Audit: %s - %s", event_type.value, data)
 
 
 class ReportingObserver(Observer):
@@ -97,7 +105,7 @@ class ReportingObserver(Observer):
     def update(self, event_type: EventType, data: Dict[str, Any]):
         """Generate report entry"""
         report_entry = {
-            'event_type': event_type.value,
+            'event_type': event_type,
             'data': data,
             'timestamp': data.get('timestamp')
         }
@@ -1,51 +1,69 @@
 """
 Account State Pattern Implementation
+
+Each state is described by a permission bitmask instead of per-class
+methods, so checking whether an operation is allowed is a single table
+lookup. States carry no per-account data and are shared as singletons.
 """
-from abc import ABC, abstractmethod
+from array import array
+from enum import IntEnum
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from domain.account.account import Account
 
 
-class AccountState(ABC):
-    """Abstract state for account"""
-    
-    @abstractmethod
+class StateId(IntEnum):
+    """Index of each state in the permission table"""
+    ACTIVE = 0
+    FROZEN = 1
+    SUSPENDED = 2
+    CLOSED = 3
+
+
+# Permission bits
+_DEPOSIT_BIT = 0b001
+_WITHDRAW_BIT = 0b010
+_TRANSFER_BIT = 0b100
+
+# Permissions per state, indexed by StateId
+_PERMS = array('B', [
+    _DEPOSIT_BIT | _WITHDRAW_BIT | _TRANSFER_BIT,  # Active
+    _DEPOSIT_BIT,                                  # Frozen: funds may only come in
+    _DEPOSIT_BIT,                                  # Suspended: can receive deposits
+    0,                                             # Closed: no operations
+])
+
+
+class AccountState:
+    """Base state for account; subclasses only set state_id and name"""
+    __slots__ = ()
+
+    state_id: int
+    name: str
+
     def deposit(self, account: 'Account', amount: float) -> bool:
         """Attempt to deposit funds"""
-        pass
-    
-    @abstractmethod
+        return bool(_PERMS[self.state_id] & _DEPOSIT_BIT)
+
     def withdraw(self, account: 'Account', amount: float) -> bool:
         """Attempt to withdraw funds"""
-        pass
-    
-    @abstractmethod
+        return bool(_PERMS[self.state_id] & _WITHDRAW_BIT)
+
     def transfer(self, account: 'Account', amount: float) -> bool:
         """Attempt to transfer funds"""
-        pass
-    
-    @abstractmethod
+        return bool(_PERMS[self.state_id] & _TRANSFER_BIT)
+
     def get_state_name(self) -> str:
         """Get the name of the current state"""
-        pass
+        return self.name
 
 
 class ActiveState(AccountState):
     """Account is active and operational"""
-    
-    def deposit(self, account: 'Account', amount: float) -> bool:
-        return True
-    
-    def withdraw(self, account: 'Account', amount: float) -> bool:
-        return True
-    
-    def transfer(self, account: 'Account', amount: float) -> bool:
-        return True
-    
-    def get_state_name(self) -> str:
-        return "Active"
+    __slots__ = ()
+    state_id = StateId.ACTIVE
+    name = "Active"
 
 
 class FrozenState(AccountState):
@@ -53,55 +71,36 @@ class FrozenState(AccountState):
     Account is frozen - temporarily restricted due to security, legal, or compliance reasons.
     - Allows: Deposits and incoming transfers (funds coming IN)
     - Blocks: Withdrawals and outgoing transfers (funds going OUT)
+    Note: Incoming transfers (to this account) are handled separately in the transfer logic.
     """
-    
-    def deposit(self, account: 'Account', amount: float) -> bool:
-        """Deposits into frozen account are allowed"""
-        return True
-    
-    def withdraw(self, account: 'Account', amount: float) -> bool:
-        """Withdrawals from frozen account are strictly prohibited"""
-        return False
-    
-    def transfer(self, account: 'Account', amount: float) -> bool:
-        """
-        Outgoing transfers from frozen account are not allowed.
-        Note: Incoming transfers (to this account) are handled separately in the transfer logic.
-        """
-        return False
-    
-    def get_state_name(self) -> str:
-        return "Frozen"
+    __slots__ = ()
+    state_id = StateId.FROZEN
+    name = "Frozen"
 
 
 class SuspendedState(AccountState):
-    """Account is suspended - limited operations"""
-    
-    def deposit(self, account: 'Account', amount: float) -> bool:
-        return True  # Can receive deposits
-    
-    def withdraw(self, account: 'Account', amount: float) -> bool:
-        return False  # Cannot withdraw
-    
-    def transfer(self, account: 'Account', amount: float) -> bool:
-        return False  # Cannot transfer
-    
-    def get_state_name(self) -> str:
-        return "Suspended"
+    """Account is suspended - limited operations (can receive deposits only)"""
+    __slots__ = ()
+    state_id = StateId.SUSPENDED
+    name = "Suspended"
 
 
 class ClosedState(AccountState):
     """Account is closed - no operations allowed"""
-    
-    def deposit(self, account: 'Account', amount: float) -> bool:
-        return False
-    
-    def withdraw(self, account: 'Account', amount: float) -> bool:
-        return False
-    
-    def transfer(self, account: 'Account', amount: float) -> bool:
-        return False
-    
-    def get_state_name(self) -> str:
-        return "Closed"
+    __slots__ = ()
+    state_id = StateId.CLOSED
+    name = "Closed"
+
+
+# Shared state instances
+ACTIVE = ActiveState()
+FROZEN = FrozenState()
+SUSPENDED = SuspendedState()
+CLOSED = ClosedState()
 
+STATES_BY_NAME = {
+    ACTIVE.name: ACTIVE,
+    FROZEN.name: FROZEN,
+    SUSPENDED.name: SUSPENDED,
+    CLOSED.name: CLOSED,
+}
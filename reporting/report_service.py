@@ -1,54 +1,75 @@
 """
 Reporting service for generating reports
 """
-from typing import List, Dict, Any
-from datetime import datetime
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator
+import orjson
+from datetime import datetime, timedelta
 from patterns.facade.banking_facade_db import BankingFacadeDB
 from domain.transaction.transaction import Transaction
 
 
+# Number of distinct days kept in the daily report cache
+DAILY_REPORT_CACHE_SIZE = 512
+# Seconds cached daily reports may be served; bounds staleness from writes by other processes
+DAILY_REPORT_TTL = 60.0
+# Seconds an account-wide financial summary may be reused
+FINANCIAL_SUMMARY_TTL = 60.0
+
+
 class ReportService:
     """Service for generating reports"""
     
     def __init__(self, banking_facade: BankingFacadeDB):
         self.facade = banking_facade
+        # Daily reports are cached per date until any transaction changes or the TTL passes
+        self._daily_report_cached = lru_cache(maxsize=DAILY_REPORT_CACHE_SIZE)(self._build_daily_report)
+        self._daily_report_version = banking_facade.transactions_version
+        self._daily_report_cleared_at = time.monotonic()
+        # (monotonic timestamp, account totals) of the last financial summary
+        self._account_totals_cache = None
     
     def get_daily_transaction_report(self, date: datetime = None) -> Dict[str, Any]:
         """Generate daily transaction report"""
         if date is None:
             date = datetime.now()
         
-        transactions = self.facade.get_all_transactions()
-        day_transactions = [
-            t for t in transactions 
-            if t.created_at.date() == date.date()
-        ]
+        version = self.facade.transactions_version
+        now = time.monotonic()
+        if version != self._daily_report_version or now - self._daily_report_cleared_at >= DAILY_REPORT_TTL:
+            self._daily_report_cached.cache_clear()
+            self._daily_report_version = version
+            self._daily_report_cleared_at = now
+        return self._daily_report_cached(date.date().isoformat())
+    
+    def _build_daily_report(self, date_iso: str) -> Dict[str, Any]:
+        """Build the daily transaction report for an ISO date"""
+        start = datetime.fromisoformat(date_iso)
+        end = start + timedelta(days=1)
         
-        total_deposits = sum(t.amount for t in day_transactions 
-                            if t.transaction_type.value == 'deposit')
-        total_withdrawals = sum(t.amount for t in day_transactions 
-                              if t.transaction_type.value == 'withdrawal')
-        total_transfers = sum(t.amount for t in day_transactions 
-                            if t.transaction_type.value == 'transfer')
+        # Filtering and totals are done by the database
+        totals = self.facade.get_transaction_totals_between(start, end)
+        day_transactions = [t.to_dict() for t in self.facade.get_transactions_between(start, end)]
         
         return {
-            'date': date.date().isoformat(),
+            'date': start.date().isoformat(),
             'total_transactions': len(day_transactions),
-            'total_deposits': total_deposits,
-            'total_withdrawals': total_withdrawals,
-            'total_transfers': total_transfers,
-            'transactions': [t.to_dict() for t in day_transactions]
+            'total_deposits': totals.get('deposit', 0.0),
+            'total_withdrawals': totals.get('withdrawal', 0.0),
+            'total_transfers': totals.get('transfer', 0.0),
+            'transactions': day_transactions
         }
     
     def get_account_summary(self, account_id: str) -> Dict[str, Any]:
         """Get account summary report"""
         account = self.facade.get_account(account_id)
-        transactions = self.facade.get_transactions_by_account(account_id)
+        recent = self.facade.get_recent_transactions_by_account(account_id, 10)
         
         return {
             'account': account.to_dict(),
-            'transaction_count': len(transactions),
-            'recent_transactions': [t.to_dict() for t in transactions[-10:]]
+            'transaction_count': self.facade.count_transactions_by_account(account_id),
+            'recent_transactions': [t.to_dict() for t in recent]
         }
     
     def get_audit_log(self) -> List[Dict[str, Any]]:
@@ -58,18 +79,27 @@ class ReportService:
         transactions = self.facade.get_all_transactions()
         return [t.to_dict() for t in transactions]
     
+    def iter_audit_log(self, batch_size: int = 10_000) -> Iterator[bytes]:
+        """Stream the audit log as newline-delimited JSON, one transaction per line"""
+        for t in self.facade.iter_all_transactions(batch_size):
+            yield orjson.dumps(t.to_dict()) + b"\n"
+    
+    def get_audit_log_columns(self) -> Dict[str, List[Any]]:
+        """Get audit log in column-oriented form (one list per field) for JSON export"""
+        return Transaction.columns_to_arrays(self.facade.get_all_transactions())
+    
     def get_financial_summary(self) -> Dict[str, Any]:
         """Get bank-wide financial summary (admin only)"""
-        accounts = self.facade.get_all_accounts()
-        total_deposits = sum(acc.balance for acc in accounts if acc.balance > 0)
-        total_loans = sum(abs(acc.balance) for acc in accounts if acc.balance < 0)
-        retained_earnings = self.facade.get_retained_earnings()
+        now = time.monotonic()
+        if self._account_totals_cache is None or now - self._account_totals_cache[0] >= FINANCIAL_SUMMARY_TTL:
+            self._account_totals_cache = (now, self.facade.get_account_totals())
+        account_totals = self._account_totals_cache[1]
         
+        # Retained earnings are read fresh so admin updates show immediately
         return {
-            'total_deposits': total_deposits,
-            'total_loans': total_loans,
-            'retained_earnings': retained_earnings,
-            'total_accounts': len(accounts),
-            'active_accounts': len([a for a in accounts if a.get_state_name() == 'Active'])
+            'total_deposits': account_totals['total_deposits'],
+            'total_loans': account_totals['total_loans'],
+            'retained_earnings': self.facade.get_retained_earnings(),
+            'total_accounts': account_totals['total_accounts'],
+            'active_accounts': account_totals['active_accounts']
         }
-
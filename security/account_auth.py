@@ -2,14 +2,51 @@
 Account-based authentication for customers
 Customers authenticate using account_id + IBAN
 """
+from __future__ import annotations
 
-from typing import Optional, Tuple
+import hmac
+import threading
+import time
+from hashlib import blake2b
+from typing import Optional, Tuple, Dict
+from config import SECRET_KEY
 from database.repository import AccountRepository, validate_iban
+from database.models import AccountStateEnum
 from utils.exceptions import UnauthorizedAccessError, AccountNotFoundError
 from datetime import datetime
-import logging
+from utils.logger import logger as banking_logger
 
-logger = logging.getLogger(__name__)
+# Child of the banking_system logger, so records reach its handlers
+logger = banking_logger.getChild('account_auth')
+
+# Recently failed (account_id, IBAN) lookups are rejected without a database
+# round-trip for a few seconds, so repeated bogus credentials cannot amplify DB load
+NEGATIVE_CACHE_TTL = 5.0
+NEGATIVE_CACHE_MAX_SIZE = 10_000
+
+# Keyed hash so raw credentials are never kept in memory
+_NEGATIVE_CACHE_KEY = blake2b(SECRET_KEY.encode(), digest_size=32).digest()
+_failed_lookups: Dict[bytes, float] = {}
+# Request threads share the cache; pruning iterates it while others insert
+_failed_lookups_lock = threading.Lock()
+
+
+def _lookup_key(account_id: str, iban: str) -> bytes:
+    """Keyed digest identifying an (account_id, IBAN) pair"""
+    iban_clean = iban.replace(' ', '').upper()
+    return blake2b(f"{account_id}|{iban_clean}".encode(), digest_size=16,
+                   key=_NEGATIVE_CACHE_KEY).digest()
+
+
+def _remember_failed_lookup(key: bytes, now: float):
+    """Record a failed lookup, pruning expired entries when the cache is full"""
+    with _failed_lookups_lock:
+        if len(_failed_lookups) >= NEGATIVE_CACHE_MAX_SIZE:
+            for expired in [k for k, expires in _failed_lookups.items() if expires <= now]:
+                del _failed_lookups[expired]
+            if len(_failed_lookups) >= NEGATIVE_CACHE_MAX_SIZE:
+                _failed_lookups.clear()
+        _failed_lookups[key] = now + NEGATIVE_CACHE_TTL
 
 
 def authenticate_account(account_id: str, iban: str) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -29,32 +66,36 @@ def authenticate_account(account_id: str, iban: str) -> Tuple[bool, Optional[str
     # Validate IBAN format
     if not validate_iban(iban):
         error_msg = "Invalid IBAN format"
-        logger.warning(f"Failed login attempt: {error_msg} - Account: {account_id}, IBAN: {iban[:4]}***")
+        logger.warning("Failed login attempt: %s - Account: %s, IBAN: %s***", error_msg, account_id, iban[:4])
+        return False, None, error_msg
+    
+    # Reject recently failed credentials without touching the database
+    key = _lookup_key(account_id, iban)
+    now = time.monotonic()
+    with _failed_lookups_lock:
+        expires = _failed_lookups.get(key)
+    if expires is not None and expires > now:
+        error_msg = "Invalid account ID or IBAN"
+        logger.warning("Failed login attempt: %s - Account: %s, IBAN: %s***", error_msg, account_id, iban[:4])
         return False, None, error_msg
     
     # Look up account by account_id and IBAN
     account = AccountRepository.get_by_account_id_and_iban(account_id, iban)
     
     if not account:
+        _remember_failed_lookup(key, now)
         error_msg = "Invalid account ID or IBAN"
-        logger.warning(f"Failed login attempt: {error_msg} - Account: {account_id}, IBAN: {iban[:4]}***")
-        return False, None, error_msg
-    
-    # Check if account is active
-    if account.is_closed:
-        error_msg = "Account is closed"
-        logger.warning(f"Failed login attempt: {error_msg} - Account: {account_id}")
+        logger.warning("Failed login attempt: %s - Account: %s, IBAN: %s***", error_msg, account_id, iban[:4])
         return False, None, error_msg
     
-    # Check account state
-    from database.models import AccountStateEnum
-    if account.state == AccountStateEnum.CLOSED:
+    # Check if account is closed (flag or state)
+    if account.is_closed or account.state == AccountStateEnum.CLOSED:
         error_msg = "Account is closed"
-        logger.warning(f"Failed login attempt: {error_msg} - Account: {account_id}")
+        logger.warning("Failed login attempt: %s - Account: %s", error_msg, account_id)
         return False, None, error_msg
     
     # Authentication successful
-    logger.info(f"Successful account authentication - Account: {account_id}")
+    logger.info("Successful account authentication - Account: %s", account_id)
     return True, account.account_id, None
 
 
@@ -69,5 +110,12 @@ def verify_account_access(authenticated_account_id: str, requested_account_id: s
     Returns:
         True if access is allowed, False otherwise
     """
-    return authenticated_account_id == requested_account_id
+    if not authenticated_account_id or not requested_account_id:
+        return False
+    try:
+        # Constant-time comparison so response timing does not leak the account ID
+        return hmac.compare_digest(authenticated_account_id, requested_account_id)
+    except TypeError:
+        # compare_digest only accepts ASCII strings; account IDs are always ASCII
+        return False
 
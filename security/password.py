@@ -1,22 +1,30 @@
 """
 Password hashing and verification utilities
-Uses Werkzeug's secure password hashing
+Uses argon2id (argon2-cffi); hashes created earlier with Werkzeug are still
+accepted and upgraded on the next successful login
 """
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from werkzeug.security import check_password_hash
+
+# argon2id cost parameters: 3 passes over 64 MiB, single lane
+_ph = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=1)
+
+_ARGON2_PREFIX = '$argon2'
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using Werkzeug's secure hashing
+    Hash a password using argon2id
     
     Args:
         password: Plain text password
-        
+    
     Returns:
         Hashed password string
     """
-    return generate_password_hash(password)
+    return _ph.hash(password)
 
 
 def verify_password(password_hash: str, password: str) -> bool:
@@ -24,13 +32,32 @@ def verify_password(password_hash: str, password: str) -> bool:
     Verify a password against its hash
     
     Args:
-        password_hash: Hashed password from database
+        password_hash: Hashed password from database (argon2 or legacy Werkzeug)
         password: Plain text password to verify
-        
+    
     Returns:
         True if password matches, False otherwise
     """
     if not password_hash:
         return False
-    return check_password_hash(password_hash, password)
+    if not password_hash.startswith(_ARGON2_PREFIX):
+        return check_password_hash(password_hash, password)
+    try:
+        return _ph.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
 
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a stored hash should be replaced after a successful login
+    
+    Args:
+        password_hash: Hashed password from database
+    
+    Returns:
+        True for legacy Werkzeug hashes and argon2 hashes with outdated parameters
+    """
+    if not password_hash or not password_hash.startswith(_ARGON2_PREFIX):
+        return True
+    return _ph.check_needs_rehash(password_hash)
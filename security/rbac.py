@@ -9,18 +9,33 @@ from flask import session
 
 def require_role(*allowed_roles: Role):
     """Decorator to require specific roles"""
+    # Resolved once at decoration time; the session stores the raw role value
+    allowed_values = frozenset(r.value for r in allowed_roles)
+    denied_message = f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
+    
     def decorator(func):
+        if len(allowed_values) == 1:
+            # Single-role endpoints compare against the one allowed value directly
+            (required_value,) = allowed_values
+            
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                user_role = session.get('user_role')
+                if not user_role:
+                    raise UnauthorizedAccessError("User not authenticated")
+                if user_role != required_value:
+                    raise UnauthorizedAccessError(denied_message)
+                return func(*args, **kwargs)
+            return wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             user_role = session.get('user_role')
             if not user_role:
                 raise UnauthorizedAccessError("User not authenticated")
             
-            role = Role(user_role)
-            if role not in allowed_roles:
-                raise UnauthorizedAccessError(
-                    f"Access denied. Required roles: {[r.value for r in allowed_roles]}"
-                )
+            if user_role not in allowed_values:
+                raise UnauthorizedAccessError(denied_message)
             
             return func(*args, **kwargs)
         return wrapper
@@ -2,7 +2,9 @@
 Database Seeding Script
 Populates the database with sample users, accounts, and transactions for testing
 """
+import io
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Fix Windows console encoding
@@ -10,15 +12,20 @@ from utils.console import setup_console_encoding
 setup_console_encoding()
 
 from config import USE_POSTGRESQL
-from database.db import db
-from database.repository import (
-    UserRepository, AccountRepository, TransactionRepository, FinancialsRepository
-)
-from database.models import TransactionStatusEnum
-from domain.roles.role import Role
-from domain.account.account_type import AccountType
-from domain.transaction.transaction import TransactionType
-from security.password import hash_password
+
+
+def _existing_keys(column, keys: list) -> set:
+    """Return which of the given keys are already present, in one query"""
+    return set(db.session.scalars(select(column).where(column.in_(keys))).all())
+
+
+def _flush_output(buffer: io.StringIO) -> None:
+    """Write buffered section output to stdout in one call and reset the buffer"""
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
+    buffer.seek(0)
+    buffer.truncate(0)
+
 
 print("=" * 60)
 print("Database Seeding Script")
@@ -26,6 +33,11 @@ print("=" * 60)
 
 # Create Flask app with database
 if USE_POSTGRESQL:
+    # Models must be registered before the app bootstrap runs create_all()
+    from database.models import (
+        User as UserModel, Account as AccountModel, Transaction as TransactionModel,
+        RoleEnum, AccountTypeEnum, TransactionStatusEnum
+    )
     try:
         from utils.console import create_app_with_db
         app = create_app_with_db()
@@ -33,6 +45,15 @@ if USE_POSTGRESQL:
         print(f"❌ Database initialization failed: {e}")
         print("💡 Make sure PostgreSQL is running and configured correctly")
         sys.exit(1)
+    
+    # Heavy imports are only needed once there is a database to seed
+    from sqlalchemy import select
+    from database.db import db
+    from database.repository import UserRepository, AccountRepository, TransactionRepository, FinancialsRepository
+    from domain.roles.role import Role
+    from domain.account.account_type import AccountType
+    from domain.transaction.transaction import TransactionType
+    from security.password import hash_password
 else:
     print("⚠️  PostgreSQL is disabled. This script requires PostgreSQL.")
     sys.exit(1)
@@ -49,14 +70,9 @@ with app.app_context():
             if response == 'yes':
                 print("🗑️  Clearing existing data...")
                 # Delete in correct order (transactions -> accounts -> users)
-                from database.models import Transaction as TransactionModel
-                from database.models import Account as AccountModel
-                from database.models import User as UserModel
-                
                 TransactionModel.query.delete()
                 AccountModel.query.delete()
                 UserModel.query.delete()
-                db.session.commit()
                 print("✅ Existing data cleared")
             else:
                 print("ℹ️  Keeping existing data, will skip duplicates")
@@ -127,37 +143,50 @@ with app.app_context():
         all_users = admin_users + employee_users + customer_users
         created_users = {}
         
+        # Rows are bulk-inserted through the session, so clearing, seeding and
+        # financials all happen in one transaction that is committed once
+        # Per-row messages are buffered and written once per section
+        output = io.StringIO()
+        
+        existing_usernames = _existing_keys(UserModel.username, [u["username"] for u in all_users])
+        now = datetime.utcnow()
+        user_rows = []
+        
+        # Hash passwords for employees and admins up front; argon2 releases the GIL,
+        # so threads hash in parallel without re-importing this script in workers
+        to_hash = [u for u in all_users if "password" in u and u["username"] not in existing_usernames]
+        with ThreadPoolExecutor() as executor:
+            password_hashes = dict(zip(
+                (u["user_id"] for u in to_hash),
+                executor.map(hash_password, (u["password"] for u in to_hash))
+            ))
+        
         for user_data in all_users:
-            try:
-                # Check if user already exists
-                existing = UserRepository.get_by_username(user_data["username"])
-                if existing:
-                    print(f"⏭️  User '{user_data['username']}' already exists, skipping...")
-                    created_users[user_data["user_id"]] = existing
-                else:
-                    # Hash password for employees and admins
-                    password_hash = None
-                    if "password" in user_data:
-                        password_hash = hash_password(user_data["password"])
-                    
-                    user = UserRepository.create(
-                        user_id=user_data["user_id"],
-                        username=user_data["username"],
-                        role=user_data["role"],
-                        email=user_data.get("email"),
-                        phone=user_data.get("phone"),
-                        password_hash=password_hash
-                    )
-                    created_users[user_data["user_id"]] = user
-                    
-                    # Print login info for employees and admins
-                    if user_data["role"] in [Role.EMPLOYEE, Role.ADMIN]:
-                        login_info = f"Email: {user_data.get('email')} or Phone: {user_data.get('phone')}, Password: {user_data.get('password')}"
-                        print(f"✅ Created {user_data['role'].value}: {user_data['username']} ({login_info})")
-                    else:
-                        print(f"✅ Created {user_data['role'].value}: {user_data['username']} ({user_data.get('email', 'N/A')})")
-            except Exception as e:
-                print(f"❌ Failed to create user {user_data['username']}: {e}")
+            if user_data["username"] in existing_usernames:
+                output.write(f"⏭️  User '{user_data['username']}' already exists, skipping...\n")
+                created_users[user_data["user_id"]] = user_data
+                continue
+            
+            user_rows.append({
+                "user_id": user_data["user_id"],
+                "username": user_data["username"],
+                "email": user_data.get("email"),
+                "phone": user_data.get("phone"),
+                "password_hash": password_hashes.get(user_data["user_id"]),
+                "role": RoleEnum(user_data["role"].value),
+                "created_at": now
+            })
+            created_users[user_data["user_id"]] = user_data
+            
+            # Print login info for employees and admins
+            if user_data["role"] in [Role.EMPLOYEE, Role.ADMIN]:
+                login_info = f"Email: {user_data.get('email')} or Phone: {user_data.get('phone')}, Password: {user_data.get('password')}"
+                output.write(f"✅ Created {user_data['role'].value}: {user_data['username']} ({login_info})\n")
+            else:
+                output.write(f"✅ Created {user_data['role'].value}: {user_data['username']} ({user_data.get('email', 'N/A')})\n")
+        
+        db.session.bulk_insert_mappings(UserModel, user_rows)
+        _flush_output(output)
         
         print("\n" + "=" * 60)
         print("Creating Accounts")
@@ -190,40 +219,38 @@ with app.app_context():
         
         created_accounts = {}
         
+        existing_ibans = dict(db.session.execute(
+            select(AccountModel.account_id, AccountModel.iban)
+            .where(AccountModel.account_id.in_([a["account_id"] for a in accounts_data]))
+        ).all())
+        new_ibans = AccountRepository.generate_unique_ibans(
+            [a["account_id"] for a in accounts_data if a["account_id"] not in existing_ibans]
+        )
+        account_rows = []
+        owner_names = {uid: u["username"] for uid, u in created_users.items()}
+        
         for account_data in accounts_data:
-            try:
-                # Check if account already exists
-                existing = AccountRepository.get(account_data["account_id"])
-                if existing:
-                    print(f"⏭️  Account '{account_data['account_id']}' already exists, skipping...")
-                    created_accounts[account_data["account_id"]] = existing
-                else:
-                    account = AccountRepository.create(
-                        account_id=account_data["account_id"],
-                        account_type=account_data["account_type"],
-                        owner_id=account_data["owner_id"],
-                        balance=account_data["balance"]
-                    )
-                    created_accounts[account_data["account_id"]] = account
-                    owner = created_users.get(account_data["owner_id"])
-                    owner_name = owner.username if owner else account_data["owner_id"]
-                    iban_display = account.iban if account.iban else "IBAN pending"
-                    print(f"✅ Created {account_data['account_type'].value} account {account_data['account_id']} for {owner_name}: ${account_data['balance']:,.2f} (IBAN: {iban_display})")
-            except Exception as e:
-                if "not found" not in str(e).lower():
-                    print(f"❌ Failed to create account {account_data['account_id']}: {e}")
-                else:
-                    # Account doesn't exist, create it
-                    account = AccountRepository.create(
-                        account_id=account_data["account_id"],
-                        account_type=account_data["account_type"],
-                        owner_id=account_data["owner_id"],
-                        balance=account_data["balance"]
-                    )
-                    created_accounts[account_data["account_id"]] = account
-                    owner = created_users.get(account_data["owner_id"])
-                    owner_name = owner.username if owner else account_data["owner_id"]
-                    print(f"✅ Created {account_data['account_type'].value} account {account_data['account_id']} for {owner_name}: ${account_data['balance']:,.2f}")
+            account_id = account_data["account_id"]
+            if account_id in existing_ibans:
+                output.write(f"⏭️  Account '{account_id}' already exists, skipping...\n")
+                created_accounts[account_id] = existing_ibans[account_id]
+                continue
+            
+            iban = new_ibans[account_id]
+            account_rows.append({
+                "account_id": account_id,
+                "iban": iban,
+                "account_type": AccountTypeEnum(account_data["account_type"].value),
+                "owner_id": account_data["owner_id"],
+                "balance": account_data["balance"],
+                "created_at": now
+            })
+            created_accounts[account_id] = iban
+            owner_name = owner_names.get(account_data["owner_id"], account_data["owner_id"])
+            output.write(f"✅ Created {account_data['account_type'].value} account {account_id} for {owner_name}: ${account_data['balance']:,.2f} (IBAN: {iban})\n")
+        
+        db.session.bulk_insert_mappings(AccountModel, account_rows)
+        _flush_output(output)
         
         print("\n" + "=" * 60)
         print("Creating Transactions")
@@ -257,72 +284,47 @@ with app.app_context():
         
         created_transactions = {}
         
+        existing_txn_ids = _existing_keys(
+            TransactionModel.transaction_id, [t["transaction_id"] for t in transactions_data]
+        )
+        transaction_rows = []
+        
         for txn_data in transactions_data:
-            try:
-                # Check if transaction already exists
-                existing = TransactionRepository.get(txn_data["transaction_id"])
-                if existing:
-                    print(f"⏭️  Transaction '{txn_data['transaction_id']}' already exists, skipping...")
-                    created_transactions[txn_data["transaction_id"]] = existing
-                else:
-                    # Create transaction
-                    transaction = TransactionRepository.create(
-                        transaction_id=txn_data["transaction_id"],
-                        transaction_type=txn_data["type"],
-                        account_id=txn_data["account_id"],
-                        amount=txn_data["amount"],
-                        target_account_id=txn_data.get("target_account_id"),
-                        description=txn_data["description"]
-                    )
-                    
-                    # Update status if not pending
-                    if txn_data["status"] != TransactionStatusEnum.PENDING:
-                        approved_by = "USER_EMP1" if txn_data["status"] == TransactionStatusEnum.COMPLETED else None
-                        TransactionRepository.update_status(
-                            transaction_id=txn_data["transaction_id"],
-                            status=txn_data["status"],
-                            approved_by=approved_by
-                        )
-                    
-                    created_transactions[txn_data["transaction_id"]] = transaction
-                    status_emoji = "✅" if txn_data["status"] == TransactionStatusEnum.COMPLETED else "⏳" if txn_data["status"] == TransactionStatusEnum.PENDING else "❌"
-                    print(f"{status_emoji} Created {txn_data['type'].value} transaction {txn_data['transaction_id']}: ${txn_data['amount']:,.2f} - {txn_data['status'].value}")
-            except Exception as e:
-                if "not found" not in str(e).lower():
-                    print(f"❌ Failed to create transaction {txn_data['transaction_id']}: {e}")
-                else:
-                    # Create it anyway
-                    transaction = TransactionRepository.create(
-                        transaction_id=txn_data["transaction_id"],
-                        transaction_type=txn_data["type"],
-                        account_id=txn_data["account_id"],
-                        amount=txn_data["amount"],
-                        target_account_id=txn_data.get("target_account_id"),
-                        description=txn_data["description"]
-                    )
-                    
-                    if txn_data["status"] != TransactionStatusEnum.PENDING:
-                        approved_by = "USER_EMP1" if txn_data["status"] == TransactionStatusEnum.COMPLETED else None
-                        TransactionRepository.update_status(
-                            transaction_id=txn_data["transaction_id"],
-                            status=txn_data["status"],
-                            approved_by=approved_by
-                        )
-                    
-                    created_transactions[txn_data["transaction_id"]] = transaction
-                    status_emoji = "✅" if txn_data["status"] == TransactionStatusEnum.COMPLETED else "⏳" if txn_data["status"] == TransactionStatusEnum.PENDING else "❌"
-                    print(f"{status_emoji} Created {txn_data['type'].value} transaction {txn_data['transaction_id']}: ${txn_data['amount']:,.2f} - {txn_data['status'].value}")
+            if txn_data["transaction_id"] in existing_txn_ids:
+                output.write(f"⏭️  Transaction '{txn_data['transaction_id']}' already exists, skipping...\n")
+                created_transactions[txn_data["transaction_id"]] = txn_data
+                continue
+            
+            # Completed transactions are inserted already approved
+            completed = txn_data["status"] == TransactionStatusEnum.COMPLETED
+            transaction_rows.append({
+                "transaction_id": txn_data["transaction_id"],
+                "transaction_type": txn_data["type"],
+                "account_id": txn_data["account_id"],
+                "target_account_id": txn_data.get("target_account_id"),
+                "amount": txn_data["amount"],
+                "status": txn_data["status"],
+                "description": txn_data["description"],
+                "approved_by": "USER_EMP1" if completed else None,
+                "created_at": now,
+                "approved_at": now if completed else None
+            })
+            created_transactions[txn_data["transaction_id"]] = txn_data
+            status_emoji = "✅" if completed else "⏳" if txn_data["status"] == TransactionStatusEnum.PENDING else "❌"
+            output.write(f"{status_emoji} Created {txn_data['type'].value} transaction {txn_data['transaction_id']}: ${txn_data['amount']:,.2f} - {txn_data['status'].value}\n")
+        
+        TransactionRepository.bulk_create(transaction_rows, commit=False)
+        _flush_output(output)
         
         # Initialize bank financials
         print("\n" + "=" * 60)
         print("Initializing Bank Financials")
         print("=" * 60)
         
-        try:
-            financials = FinancialsRepository.get_or_create()
-            print(f"✅ Bank financials initialized: Retained Earnings = ${financials.retained_earnings:,.2f}")
-        except Exception as e:
-            print(f"⚠️  Could not initialize financials: {e}")
+        financials = FinancialsRepository.get_or_create(commit=False)
+        print(f"✅ Bank financials initialized: Retained Earnings = ${financials.retained_earnings:,.2f}")
+        
+        db.session.commit()
         
         print("\n" + "=" * 60)
         print("✅ Database Seeding Completed!")
@@ -335,29 +337,26 @@ with app.app_context():
         print(f"   Transactions created: {len(created_transactions)}")
         
         print("\n👥 Test Users:")
-        print("\n   Admins (Login: Username + Email/Phone + Password):")
-        print("     - admin1")
-        print("       Email: admin1@bank.com or Phone: +1234567890")
-        print("       Password: admin123")
-        print("     - admin2")
-        print("       Email: admin2@bank.com or Phone: +1234567891")
-        print("       Password: admin456")
-        print("\n   Employees (Login: Username + Email/Phone + Password):")
-        print("     - employee1")
-        print("       Email: emp1@bank.com or Phone: +1234567892")
-        print("       Password: emp123")
-        print("     - employee2")
-        print("       Email: emp2@bank.com or Phone: +1234567893")
-        print("       Password: emp456")
-        print("     - employee3")
-        print("       Email: emp3@bank.com or Phone: +1234567894")
-        print("       Password: emp789")
+        for title, users in (("Admins", admin_users), ("Employees", employee_users)):
+            print(f"\n   {title} (Login: Username + Email/Phone + Password):")
+            for u in users:
+                print(f"     - {u['username']}\n"
+                      f"       Email: {u['email']} or Phone: {u['phone']}\n"
+                      f"       Password: {u['password']}")
+        
+        account_types_by_owner = {}
+        for account_data in accounts_data:
+            account_types_by_owner.setdefault(account_data["owner_id"], []).append(account_data["account_type"])
+        
         print("\n   Customers:")
-        print("     - john_doe (john.doe@email.com) - 3 accounts")
-        print("     - jane_smith (jane.smith@email.com) - 2 accounts")
-        print("     - bob_wilson (bob.wilson@email.com) - 1 account")
-        print("     - alice_brown (alice.brown@email.com) - 3 accounts (including loan)")
-        print("     - charlie_davis (charlie.davis@email.com) - 2 accounts (including business loan)")
+        for u in customer_users:
+            types = account_types_by_owner.get(u["user_id"], [])
+            count = f"{len(types)} account" + ("" if len(types) == 1 else "s")
+            if AccountType.BUSINESS_LOAN in types:
+                count += " (including business loan)"
+            elif AccountType.LOAN in types:
+                count += " (including loan)"
+            print(f"     - {u['username']} ({u['email']}) - {count}")
         
         print("\n💡 You can now:")
         print("   1. Run: python app.py")
@@ -367,9 +366,9 @@ with app.app_context():
         print("   Note: Each account has a unique IBAN. Check the account creation output above for IBANs.")
         print("   Login format: Account ID + IBAN (both required)")
         print("\n   Example accounts:")
-        for acc_id, acc in list(created_accounts.items())[:5]:
-            if acc and hasattr(acc, 'iban') and acc.iban:
-                print(f"     - Account: {acc_id}, IBAN: {acc.iban}")
+        for acc_id, iban in list(created_accounts.items())[:5]:
+            if iban:
+                print(f"     - Account: {acc_id}, IBAN: {iban}")
         
     except Exception as e:
         print(f"\n❌ Error during seeding: {e}")
@@ -1,39 +1,74 @@
 """
 Approval service for transaction approvals
 """
-from typing import List
+import time
+from functools import lru_cache
+from typing import List, Optional
 from domain.transaction.transaction import Transaction
 from domain.roles.role import Role
 from patterns.facade.banking_facade_db import BankingFacadeDB
+from services.transaction_service import TransactionService
+from config import EMPLOYEE_APPROVE_THRESHOLD, PENDING_APPROVALS_PAGE_SIZE
+
+# A few (role, page) queues per worker; cleared whenever a transaction changes
+PENDING_APPROVALS_CACHE_SIZE = 16
+# Seconds a cached queue may be served; bounds staleness from writes by other processes
+PENDING_APPROVALS_TTL = 5.0
 
 
 class ApprovalService:
     """Service for transaction approvals"""
     
-    def __init__(self, banking_facade: BankingFacadeDB):
+    def __init__(self, banking_facade: BankingFacadeDB, transaction_service: TransactionService):
         self.facade = banking_facade
+        # Approvals go through the transaction service so its per-request caches stay consistent
+        self.transaction_service = transaction_service
+        self._pending_cached = lru_cache(maxsize=PENDING_APPROVALS_CACHE_SIZE)(self._fetch_pending_approvals)
+        self._pending_version = banking_facade.transactions_version
+        self._pending_cleared_at = time.monotonic()
+    
+    def get_pending_approvals(self, user_role: Role, page: Optional[int] = None) -> List[Transaction]:
+        """
+        Get transactions pending approval for a role
+        
+        If page (1-based) is given, only that page of the queue is fetched from the database.
+        Repeated polls are served from memory until the facade records a transaction
+        change or PENDING_APPROVALS_TTL seconds pass.
+        """
+        version = self.facade.transactions_version
+        now = time.monotonic()
+        if version != self._pending_version or now - self._pending_cleared_at >= PENDING_APPROVALS_TTL:
+            self._pending_cached.cache_clear()
+            self._pending_version = version
+            self._pending_cleared_at = now
+        return list(self._pending_cached(user_role, page))
     
-    def get_pending_approvals(self, user_role: Role) -> List[Transaction]:
-        """Get transactions pending approval for a role"""
-        pending = self.facade.get_pending_transactions()
+    def _fetch_pending_approvals(self, user_role: Role, page: Optional[int]) -> List[Transaction]:
+        """Query the pending approval queue for a role"""
+        limit, offset = None, 0
+        if page is not None:
+            limit = PENDING_APPROVALS_PAGE_SIZE
+            offset = (max(page, 1) - 1) * PENDING_APPROVALS_PAGE_SIZE
         
         if user_role == Role.ADMIN:
             # Admin can see all pending
-            return pending
+            return self.facade.get_pending_transactions(limit=limit, offset=offset)
         elif user_role == Role.EMPLOYEE:
             # Employee can see medium-value transactions
-            from config import EMPLOYEE_APPROVE_THRESHOLD
-            return [t for t in pending if t.amount <= EMPLOYEE_APPROVE_THRESHOLD]
+            return self.facade.get_pending_transactions(
+                max_amount=EMPLOYEE_APPROVE_THRESHOLD, limit=limit, offset=offset
+            )
         else:
             return []
     
     def approve_transaction(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
         """Approve a transaction"""
-        return self.facade.approve_transaction(transaction_id, approver_role, approver_id)
+        return self.transaction_service.approve_transaction(transaction_id, approver_role, approver_id)
     
     def complete_transaction(self, transaction_id: str, executor_role: Role, executor_id: str) -> bool:
         """Execute an approved transaction and mark it as completed"""
-        return self.facade.complete_transaction(transaction_id, executor_role, executor_id)
+        with self.facade.account_cache():
+            return self.facade.complete_transaction(transaction_id, executor_role, executor_id)
     
     def deny_transaction(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
         """Deny/reject a transaction"""
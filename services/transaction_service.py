@@ -1,11 +1,66 @@
 """
 Transaction service - business logic for transactions
 """
-from typing import List
+import itertools
+import re
+import threading
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple, Union
+from flask import current_app
 from domain.transaction.transaction import Transaction
 from domain.roles.role import Role
 from patterns.facade.banking_facade_db import BankingFacadeDB
-from utils.exceptions import InvalidTransactionError
+from utils.exceptions import InvalidTransactionError, UnauthorizedAccessError
+from utils.money import require_whole_cents
+from config import AUTO_APPROVE_THRESHOLD, DB_POOL_SIZE
+
+# Authorization cache keys are tuples of small ints rather than strings
+_ROLE_IDS = {Role.CUSTOMER: 0, Role.EMPLOYEE: 1, Role.ADMIN: 2}
+_OP_IDS = {"deposit": 0, "withdraw": 1, "transfer": 2, "approve": 3}
+
+# User/account IDs are interned to ints; IDs are never reused, even after the
+# table is reset, so a key can never silently start meaning a different account
+INTERN_TABLE_MAX_SIZE = 100_000
+_interned_ids: Dict[str, int] = {}
+_next_interned_id = itertools.count()
+
+# Bound on remembered (user, account) pairs known not to be owned
+DENIED_PAIRS_MAX_SIZE = 100_000
+
+# process_batch serializes work per account through a fixed pool of lock stripes,
+# so the number of locks stays bounded however many accounts a process sees
+ACCOUNT_LOCK_STRIPES = 64
+
+# Account IDs look like ACC_1A2B3C4D (at most 50 chars, the column width); anything
+# else cannot exist, so it is rejected before the facade queries the database
+_ACCOUNT_ID_RE = re.compile(r'ACC_[A-Z0-9]{1,46}')
+
+
+def _intern_id(value: str) -> int:
+    """Map a user or account ID to a small int that is never handed to another ID"""
+    interned = _interned_ids.get(value)
+    if interned is None:
+        if len(_interned_ids) >= INTERN_TABLE_MAX_SIZE:
+            _interned_ids.clear()
+        interned = _interned_ids.setdefault(value, next(_next_interned_id))
+    return interned
+
+
+def _require_account_id(account_id: Optional[str]):
+    """Raise InvalidTransactionError unless account_id is a well-formed account ID"""
+    if not isinstance(account_id, str) or _ACCOUNT_ID_RE.fullmatch(account_id) is None:
+        raise InvalidTransactionError(f"Invalid account ID: {account_id!r}")
+
+
+def _with_account_cache(method):
+    """Share account lookups between the checks and the facade call of one service operation"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.facade.account_cache():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class TransactionService:
@@ -13,15 +68,77 @@ class TransactionService:
     
     def __init__(self, banking_facade: BankingFacadeDB):
         self.facade = banking_facade
+        # Authorization decisions for the request being handled by this thread
+        self._authz_local = threading.local()
+        # Customer/account pairs that failed the ownership check, kept across requests.
+        # Account owners never change, so an entry stays valid until evicted
+        self._denied_pairs: Set[Tuple[int, int]] = set()
+        # Lock stripes serializing process_batch work on the same account
+        self._account_locks: List[threading.Lock] = [threading.Lock() for _ in range(ACCOUNT_LOCK_STRIPES)]
+        # Debit authorization specialized per role, so callers dispatch once
+        # instead of branching on the role inside every check
+        self._auth_checks = {
+            Role.CUSTOMER: self._check_customer_auth,
+            Role.EMPLOYEE: self._allow_staff,
+            Role.ADMIN: self._allow_staff,
+        }
+    
+    @property
+    def _authz_cache(self) -> Dict[Tuple[int, int, int, int], bool]:
+        cache = getattr(self._authz_local, 'cache', None)
+        if cache is None:
+            cache = self._authz_local.cache = {}
+        return cache
+    
+    def clear_authz_cache(self):
+        """Forget memoized authorization decisions (called at the end of every request)"""
+        self._authz_local.cache = {}
+    
+    def _check_customer_auth(self, user_id: Optional[str], account_id: str, op: str):
+        """
+        Reject a customer moving money out of an account they do not own.
+        Decisions are memoized per request, so repeated checks on the same account
+        (batch items, several operations in one request) skip the account lookup;
+        denials are also remembered across requests.
+        The facade still enforces the same rule.
+        """
+        if not user_id:
+            return
+        user_key = _intern_id(user_id)
+        account_key = _intern_id(account_id)
+        key = (user_key, _ROLE_IDS[Role.CUSTOMER], account_key, _OP_IDS[op])
+        allowed = self._authz_cache.get(key)
+        if allowed is None:
+            if (user_key, account_key) in self._denied_pairs:
+                allowed = False
+            else:
+                allowed = self.facade.get_account(account_id).owner_id == user_id
+                if not allowed:
+                    if len(self._denied_pairs) >= DENIED_PAIRS_MAX_SIZE:
+                        self._denied_pairs.clear()
+                    self._denied_pairs.add((user_key, account_key))
+            self._authz_cache[key] = allowed
+        if not allowed:
+            raise UnauthorizedAccessError(
+                f"Security violation: Customers can only {op} from their own accounts."
+            )
+    
+    @staticmethod
+    def _allow_staff(user_id: Optional[str], account_id: str, op: str):
+        """Employees and admins may move money out of any account"""
     
+    @_with_account_cache
     def deposit(self, account_id: str, amount: float, description: str = "",
                user_role: Role = Role.CUSTOMER, user_id: str = None) -> Transaction:
         """
         Deposit funds into any account.
         Anyone (customer, employee, admin) can deposit into any account.
         """
+        _require_account_id(account_id)
+        require_whole_cents(amount)
         return self.facade.deposit(account_id, amount, description, user_role, user_id)
     
+    @_with_account_cache
     def withdraw(self, account_id: str, amount: float, description: str = "",
                 user_role: Role = Role.CUSTOMER, user_id: str = None,
                 authenticated_account_id: str = None) -> Transaction:
@@ -31,8 +148,13 @@ class TransactionService:
         For user-based auth: Customers can only withdraw from their own accounts.
         Employees and admins can withdraw from any account.
         """
+        _require_account_id(account_id)
+        require_whole_cents(amount)
+        if not authenticated_account_id:
+            self._auth_checks[user_role](user_id, account_id, "withdraw")
         return self.facade.withdraw(account_id, amount, description, user_role, user_id, authenticated_account_id)
     
+    @_with_account_cache
     def transfer(self, from_account_id: str, to_account_id: str, 
                 amount: float, description: str = "",
                 user_role: Role = Role.CUSTOMER, user_id: str = None,
@@ -43,21 +165,152 @@ class TransactionService:
         For user-based auth: Customers can only transfer from their own accounts.
         Employees and admins can transfer from any account to any account.
         """
+        _require_account_id(from_account_id)
+        _require_account_id(to_account_id)
+        require_whole_cents(amount)
+        # Auto-approved transfers take the facade's single-UPDATE path, whose guard
+        # already requires the source to be owned by user_id; skip the extra lookup
+        if not authenticated_account_id and not 0 < amount <= AUTO_APPROVE_THRESHOLD:
+            self._auth_checks[user_role](user_id, from_account_id, "transfer")
         return self.facade.transfer(from_account_id, to_account_id, amount, description, user_role, user_id, authenticated_account_id)
     
+    @_with_account_cache
+    def deposit_many(self, deposits: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                     user_id: str = None) -> List[Transaction]:
+        """
+        Deposit into several accounts with a single commit.
+        Items are dicts with account_id, amount and optional description.
+        """
+        for item in deposits:
+            _require_account_id(item['account_id'])
+            require_whole_cents(item['amount'])
+        return self.facade.deposit_many(deposits, user_role, user_id)
+    
+    @_with_account_cache
+    def withdraw_many(self, withdrawals: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                      user_id: str = None, authenticated_account_id: str = None) -> List[Transaction]:
+        """
+        Withdraw from several accounts with a single commit; the same access rules as withdraw() apply.
+        Items are dicts with account_id, amount and optional description.
+        """
+        check_auth = self._auth_checks[user_role]
+        for item in withdrawals:
+            _require_account_id(item['account_id'])
+            require_whole_cents(item['amount'])
+            if not authenticated_account_id:
+                check_auth(user_id, item['account_id'], "withdraw")
+        return self.facade.withdraw_many(withdrawals, user_role, user_id, authenticated_account_id)
+    
+    @_with_account_cache
+    def transfer_many(self, transfers: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                      user_id: str = None, authenticated_account_id: str = None) -> List[Transaction]:
+        """
+        Perform several transfers with a single commit; the same access rules as transfer() apply.
+        Items are dicts with from_account_id, to_account_id, amount and optional description.
+        """
+        check_auth = self._auth_checks[user_role]
+        for item in transfers:
+            _require_account_id(item['from_account_id'])
+            _require_account_id(item['to_account_id'])
+            require_whole_cents(item['amount'])
+            if not authenticated_account_id:
+                check_auth(user_id, item['from_account_id'], "transfer")
+        return self.facade.transfer_many(transfers, user_role, user_id, authenticated_account_id)
+    
+    def process_batch(self, txs: List[Dict[str, Any]], user_role: Role = Role.CUSTOMER,
+                      user_id: str = None) -> List[Union[Transaction, Exception]]:
+        """
+        Run independent transactions concurrently, each in its own database transaction.
+        Items are dicts with a 'type' ('deposit', 'withdraw' or 'transfer') plus the
+        keyword arguments of the matching method. Transactions are grouped into waves
+        whose members touch disjoint accounts; waves run one after another, so items on
+        the same account keep their submission order. Unlike the *_many methods this is
+        not all-or-nothing: the result list holds each item's Transaction, or the
+        exception it raised, in input order.
+        """
+        waves: List[List[int]] = []
+        last_wave: Dict[str, int] = {}
+        for index, tx in enumerate(txs):
+            accounts = self._batch_accounts(tx)
+            wave = max((last_wave.get(account_id, -1) for account_id in accounts), default=-1) + 1
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(index)
+            for account_id in accounts:
+                last_wave[account_id] = wave
+        
+        app = current_app._get_current_object()
+        results: List[Union[Transaction, Exception, None]] = [None] * len(txs)
+        
+        def run(index: int):
+            tx = txs[index]
+            # Each worker gets its own app context and therefore its own session
+            with app.app_context():
+                with self._lock_accounts(self._batch_accounts(tx)):
+                    try:
+                        results[index] = self._run_batch_item(tx, user_role, user_id)
+                    except Exception as e:
+                        results[index] = e
+        
+        with ThreadPoolExecutor(max_workers=DB_POOL_SIZE) as executor:
+            for wave in waves:
+                # Consume the iterator so the next wave starts only after this one finished
+                list(executor.map(run, wave))
+        return results
+    
+    @staticmethod
+    def _batch_accounts(tx: Dict[str, Any]) -> frozenset:
+        """Accounts a process_batch item reads or writes"""
+        if tx['type'] == "transfer":
+            return frozenset((tx['from_account_id'], tx['to_account_id']))
+        return frozenset((tx['account_id'],))
+    
+    def _lock_accounts(self, account_ids: frozenset) -> ExitStack:
+        """Acquire the accounts' lock stripes in index order so workers cannot deadlock"""
+        stack = ExitStack()
+        # Accounts sharing a stripe take it once; the locks are not reentrant
+        for stripe in sorted({hash(account_id) % ACCOUNT_LOCK_STRIPES for account_id in account_ids}):
+            stack.enter_context(self._account_locks[stripe])
+        return stack
+    
+    def _run_batch_item(self, tx: Dict[str, Any], user_role: Role, user_id: Optional[str]) -> Transaction:
+        """Dispatch a single process_batch item to deposit, withdraw or transfer"""
+        args = {key: value for key, value in tx.items() if key != 'type'}
+        if tx['type'] == "deposit":
+            return self.deposit(user_role=user_role, user_id=user_id, **args)
+        if tx['type'] == "withdraw":
+            return self.withdraw(user_role=user_role, user_id=user_id, **args)
+        if tx['type'] == "transfer":
+            return self.transfer(user_role=user_role, user_id=user_id, **args)
+        raise InvalidTransactionError(f"Unknown transaction type: {tx['type']}")
+    
+    @_with_account_cache
     def approve_transaction(self, transaction_id: str, approver_role: Role, approver_id: str) -> bool:
         """Approve a pending transaction"""
+        # Approval can change what callers may do next; drop memoized decisions
+        self.clear_authz_cache()
         return self.facade.approve_transaction(transaction_id, approver_role, approver_id)
     
-    def get_pending_transactions(self) -> List[Transaction]:
-        """Get pending transactions"""
-        return self.facade.get_pending_transactions()
+    def get_pending_transactions(self, limit: Optional[int] = None, offset: int = 0) -> List[Transaction]:
+        """Get pending transactions, optionally one page of them"""
+        return self.facade.get_pending_transactions(limit=limit, offset=offset)
     
-    def get_account_transactions(self, account_id: str) -> List[Transaction]:
-        """Get transactions for an account"""
-        return self.facade.get_transactions_by_account(account_id)
+    def get_account_transactions(self, account_id: str, limit: Optional[int] = None,
+                                 offset: int = 0) -> List[Transaction]:
+        """Get transactions for an account, optionally one page of them"""
+        _require_account_id(account_id)
+        return self.facade.get_transactions_by_account(account_id, limit, offset)
+    
+    def get_recent_transactions(self, account_id: str, n: int = 10) -> List[Transaction]:
+        """Get the n most recent transactions for an account, oldest first"""
+        _require_account_id(account_id)
+        return self.facade.get_recent_transactions_by_account(account_id, n)
     
     def get_all_transactions(self) -> List[Transaction]:
         """Get all transactions"""
         return self.facade.get_all_transactions()
+    
+    def iter_all_transactions(self, yield_per: int = 500) -> Iterator[Transaction]:
+        """Iterate over all transactions, holding only yield_per rows in memory at a time"""
+        return self.facade.iter_all_transactions(yield_per)
 
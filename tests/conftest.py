@@ -0,0 +1,59 @@
+"""
+Shared fixtures for tests that need PostgreSQL
+Set TEST_DATABASE_URI to a scratch database; its tables are emptied after every test
+"""
+import os
+import pytest
+
+TEST_DATABASE_URI = os.getenv('TEST_DATABASE_URI')
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Flask app bound to the test database"""
+    if not TEST_DATABASE_URI:
+        pytest.skip("TEST_DATABASE_URI is not set")
+    from flask import Flask
+    import database.db as database_db
+
+    database_db.DATABASE_URI = TEST_DATABASE_URI
+    app = Flask(__name__)
+    database_db.init_db(app)
+    return app
+
+
+@pytest.fixture
+def db_session(app):
+    """Session inside an app context; all banking rows are deleted afterwards"""
+    from database.db import db
+    from database.models import User, Account, Transaction
+
+    with app.app_context():
+        yield db.session
+        db.session.rollback()
+        for model in (Transaction, Account, User):
+            db.session.query(model).delete()
+        db.session.commit()
+
+
+@pytest.fixture
+def make_account(db_session):
+    """Create an account (and its owner, if new) with the given balance"""
+    from database.repository import UserRepository, AccountRepository
+    from domain.account.account_type import AccountType
+    from domain.roles.role import Role
+
+    owners = set()
+    count = 0
+
+    def make(owner_id: str, balance: float) -> str:
+        nonlocal count
+        if owner_id not in owners:
+            UserRepository.create(owner_id, owner_id.lower(), Role.CUSTOMER)
+            owners.add(owner_id)
+        count += 1
+        account_id = f"ACC_{count:08d}"
+        AccountRepository.create(account_id, AccountType.CHECKING, owner_id, balance)
+        return account_id
+
+    return make
@@ -0,0 +1,31 @@
+"""
+Operations each account state permits, via its permission bitmask
+"""
+import pytest
+
+from patterns.state.account_state import (
+    ACTIVE, FROZEN, SUSPENDED, CLOSED, STATES_BY_NAME,
+    ActiveState, FrozenState, SuspendedState, ClosedState
+)
+
+
+@pytest.mark.parametrize('state, deposit, withdraw, transfer', [
+    (ACTIVE, True, True, True),
+    (FROZEN, True, False, False),
+    (SUSPENDED, True, False, False),
+    (CLOSED, False, False, False),
+])
+def test_state_permissions(state, deposit, withdraw, transfer):
+    assert state.deposit(None, 10.0) is deposit
+    assert state.withdraw(None, 10.0) is withdraw
+    assert state.transfer(None, 10.0) is transfer
+
+
+def test_states_are_shared_singletons():
+    assert STATES_BY_NAME == {
+        "Active": ACTIVE, "Frozen": FROZEN, "Suspended": SUSPENDED, "Closed": CLOSED,
+    }
+    assert [type(state) for state in (ACTIVE, FROZEN, SUSPENDED, CLOSED)] == [
+        ActiveState, FrozenState, SuspendedState, ClosedState,
+    ]
+    assert all(state.get_state_name() == name for name, state in STATES_BY_NAME.items())
@@ -0,0 +1,56 @@
+"""
+IBAN format and MOD-97 checksum validation
+"""
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+from database.repository import validate_iban, generate_iban
+
+
+@pytest.mark.parametrize('iban', [
+    "GB82WEST12345698765432",
+    "GB82 WEST 1234 5698 7654 32",
+    "gb82west12345698765432",
+    "DE89370400440532013000",
+    "NL91ABNA0417164300",
+    "FR1420041010050500013M02606",
+    "NO9386011117947",
+])
+def test_valid_ibans(iban):
+    assert validate_iban(iban)
+
+
+def test_generated_ibans_are_valid():
+    assert all(validate_iban(generate_iban()) for _ in range(100))
+
+
+@pytest.mark.parametrize('iban', [
+    "GB83WEST12345698765432",
+    "GB82WEST12345698765433",
+    "DE89370400440532013001",
+])
+def test_bad_check_digits(iban):
+    assert not validate_iban(iban)
+
+
+@pytest.mark.parametrize('iban', [
+    "GB82-WEST-1234-5698-7654-32",
+    "GB82WEST1234569876543!",
+    "GB82WEST1234569876543٣",
+    "GB82WEST12345698765432É",
+    "1282WEST12345698765432",
+])
+def test_bad_characters(iban):
+    assert not validate_iban(iban)
+
+
+@pytest.mark.parametrize('iban', [
+    None,
+    "",
+    # Correct check digits, but shorter than 15 or longer than 34 characters
+    "NO3786011117",
+    "GB14WEST123456987654321234567890123",
+])
+def test_wrong_length(iban):
+    assert not validate_iban(iban)
@@ -0,0 +1,47 @@
+"""
+Dollar/cent conversion and whole-cent validation
+"""
+import pytest
+
+from utils.exceptions import InvalidTransactionError, NonIntegerAmountError
+from utils.money import to_cents, from_cents, require_whole_cents
+
+
+@pytest.mark.parametrize('amount, cents', [
+    (0.0, 0),
+    (0.1, 10),
+    (0.29, 29),
+    (19.99, 1999),
+    (1234.56, 123456),
+    (-5.05, -505),
+])
+def test_to_cents_absorbs_float_noise(amount, cents):
+    assert to_cents(amount) == cents
+    assert from_cents(cents) == amount
+
+
+def test_cent_arithmetic_is_exact():
+    assert from_cents(to_cents(0.1) + to_cents(0.2)) == 0.3
+
+
+@pytest.mark.parametrize('amount', [0.01, 0.1 + 0.2, 100, 99999.99])
+def test_whole_cents_accepted(amount):
+    assert require_whole_cents(amount) == to_cents(amount)
+
+
+@pytest.mark.parametrize('amount', [0.001, 10.005, 1.2345])
+def test_fractional_cents_rejected(amount):
+    with pytest.raises(NonIntegerAmountError):
+        require_whole_cents(amount)
+
+
+@pytest.mark.parametrize('amount', [float('nan'), float('inf'), float('-inf')])
+def test_non_finite_amounts_rejected(amount):
+    with pytest.raises(NonIntegerAmountError):
+        to_cents(amount)
+    with pytest.raises(NonIntegerAmountError):
+        require_whole_cents(amount)
+
+
+def test_non_integer_amount_is_an_invalid_transaction():
+    assert issubclass(NonIntegerAmountError, InvalidTransactionError)
@@ -0,0 +1,104 @@
+"""
+Wave scheduling and account locking in TransactionService.process_batch,
+without a database: each item's work is replaced by a recording stub
+"""
+import threading
+import time
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+from flask import Flask
+
+from domain.roles.role import Role
+from services.transaction_service import TransactionService, ACCOUNT_LOCK_STRIPES
+from utils.exceptions import InsufficientFundsError
+
+
+@pytest.fixture
+def service():
+    app = Flask(__name__)
+    with app.app_context():
+        yield TransactionService(banking_facade=None)
+
+
+def deposit(account_id):
+    return {'type': "deposit", 'account_id': account_id, 'amount': 10.0}
+
+
+def transfer(from_account_id, to_account_id):
+    return {'type': "transfer", 'from_account_id': from_account_id,
+            'to_account_id': to_account_id, 'amount': 10.0}
+
+
+def test_items_on_one_account_run_in_order_and_never_overlap(service):
+    txs = [deposit("ACC_A"), deposit("ACC_B"), transfer("ACC_A", "ACC_C"),
+           deposit("ACC_C"), deposit("ACC_A"), transfer("ACC_B", "ACC_A")]
+    # Items are looked up by identity: equal dicts are still separate items
+    positions = {id(tx): index for index, tx in enumerate(txs)}
+    started = {}
+    active = set()
+    guard = threading.Lock()
+
+    def run_item(tx, user_role, user_id):
+        index = positions[id(tx)]
+        accounts = service._batch_accounts(tx)
+        with guard:
+            assert not accounts & active, "two items on one account ran at once"
+            active.update(accounts)
+            for account_id in accounts:
+                started.setdefault(account_id, []).append(index)
+        time.sleep(0.01)
+        with guard:
+            active.difference_update(accounts)
+        return index
+
+    service._run_batch_item = run_item
+    results = service.process_batch(txs, user_role=Role.EMPLOYEE)
+
+    assert results == list(range(len(txs)))
+    assert started == {"ACC_A": [0, 2, 4, 5], "ACC_B": [1, 5], "ACC_C": [2, 3]}
+
+
+def test_disjoint_items_run_concurrently(service):
+    txs = [deposit("ACC_A"), deposit("ACC_B")]
+    # Both items must be inside the barrier together, or it times out
+    barrier = threading.Barrier(len(txs), timeout=5)
+
+    def run_item(tx, user_role, user_id):
+        barrier.wait()
+        return tx['account_id']
+
+    service._run_batch_item = run_item
+
+    assert service.process_batch(txs, user_role=Role.EMPLOYEE) == ["ACC_A", "ACC_B"]
+
+
+def test_failures_are_returned_in_place(service):
+    txs = [deposit("ACC_A"), deposit("ACC_B"), deposit("ACC_A")]
+    error = InsufficientFundsError("Insufficient funds")
+
+    def run_item(tx, user_role, user_id):
+        if tx is txs[1]:
+            raise error
+        return tx['account_id']
+
+    service._run_batch_item = run_item
+
+    assert service.process_batch(txs, user_role=Role.EMPLOYEE) == ["ACC_A", error, "ACC_A"]
+
+
+def test_accounts_sharing_a_stripe_lock_it_once(service):
+    first = "ACC_0"
+    second = next(f"ACC_{n}" for n in range(1, 10_000)
+                  if hash(f"ACC_{n}") % ACCOUNT_LOCK_STRIPES == hash(first) % ACCOUNT_LOCK_STRIPES)
+
+    def lock_both():
+        with service._lock_accounts(frozenset((first, second))):
+            pass
+
+    worker = threading.Thread(target=lock_both, daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive(), "locking two accounts on one stripe deadlocked"
+    assert len(service._account_locks) == ACCOUNT_LOCK_STRIPES
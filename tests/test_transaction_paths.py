@@ -0,0 +1,218 @@
+"""
+Balances and statuses after the fast and batched transaction paths:
+guarded single-statement transfers, all-or-nothing batches, single-statement
+approvals and the concurrent process_batch
+"""
+import threading
+import pytest
+
+pytest.importorskip('flask_sqlalchemy')
+
+from database.db import db
+from database.models import (
+    User as UserModel, Account as AccountModel, Transaction as TransactionModel,
+    TransactionStatusEnum
+)
+from domain.roles.role import Role
+from domain.transaction.transaction import Transaction, TransactionStatus
+from patterns.facade.banking_facade_db import BankingFacadeDB
+from services.transaction_service import TransactionService
+from utils.exceptions import InsufficientFundsError, UnauthorizedAccessError
+
+
+@pytest.fixture
+def facade(db_session):
+    return BankingFacadeDB()
+
+
+def balances(*account_ids):
+    """Current balances as stored in the database"""
+    db.session.rollback()
+    return [db.session.get(AccountModel, account_id).balance for account_id in account_ids]
+
+
+def statuses(account_id):
+    """Statuses of the transactions debiting or crediting an account, oldest first"""
+    db.session.rollback()
+    rows = TransactionModel.query.filter(
+        (TransactionModel.account_id == account_id) |
+        (TransactionModel.target_account_id == account_id)
+    ).order_by(TransactionModel.created_at).all()
+    return [row.status for row in rows]
+
+
+# Guarded single-statement transfer
+
+def test_fast_transfer_moves_funds(facade, make_account):
+    source = make_account("USER_A", 500.0)
+    target = make_account("USER_B", 0.0)
+
+    transaction = facade._transfer_fast(source, target, 100.0, "", Role.CUSTOMER, "USER_A", None)
+
+    assert transaction is not None
+    assert transaction.status == TransactionStatus.COMPLETED
+    assert balances(source, target) == [400.0, 100.0]
+    assert statuses(source) == [TransactionStatusEnum.COMPLETED]
+
+
+def test_fast_transfer_guard_rejects_overdraft(facade, make_account):
+    source = make_account("USER_A", 50.0)
+    target = make_account("USER_B", 0.0)
+
+    # The target row passes its guard; its one-sided update must not survive
+    assert facade._transfer_fast(source, target, 100.0, "", Role.CUSTOMER, "USER_A", None) is None
+    assert balances(source, target) == [50.0, 0.0]
+
+    with pytest.raises(InsufficientFundsError):
+        facade.transfer(source, target, 100.0, user_role=Role.CUSTOMER, user_id="USER_A")
+
+    assert balances(source, target) == [50.0, 0.0]
+    assert statuses(source) == [TransactionStatusEnum.REJECTED]
+
+
+def test_fast_transfer_guard_rejects_foreign_account(facade, make_account):
+    source = make_account("USER_A", 500.0)
+    target = make_account("USER_B", 0.0)
+
+    assert facade._transfer_fast(source, target, 100.0, "", Role.CUSTOMER, "USER_B", None) is None
+
+    with pytest.raises(UnauthorizedAccessError):
+        facade.transfer(source, target, 100.0, user_role=Role.CUSTOMER, user_id="USER_B")
+
+    assert balances(source, target) == [500.0, 0.0]
+    assert statuses(source) == []
+
+
+def test_serializable_path_refuses_uncommitted_writes(facade, make_account):
+    source = make_account("USER_A", 500.0)
+    target = make_account("USER_B", 0.0)
+    db.session.add(UserModel(user_id="USER_C", username="user_c"))
+
+    with pytest.raises(RuntimeError):
+        facade.transfer(source, target, 100.0, user_role=Role.CUSTOMER, user_id="USER_A")
+
+    # The caller's staged user was neither committed nor discarded
+    assert db.session.new
+    assert balances(source, target) == [500.0, 0.0]
+    assert db.session.get(UserModel, "USER_C") is None
+
+
+# All-or-nothing batches
+
+def test_transfer_many_applies_items_in_order(facade, make_account):
+    a = make_account("USER_A", 100.0)
+    b = make_account("USER_B", 0.0)
+    c = make_account("USER_C", 0.0)
+
+    facade.transfer_many([
+        {'from_account_id': a, 'to_account_id': b, 'amount': 60.0},
+        {'from_account_id': b, 'to_account_id': c, 'amount': 30.0},
+    ], user_role=Role.EMPLOYEE)
+
+    assert balances(a, b, c) == [40.0, 30.0, 30.0]
+    assert statuses(b) == [TransactionStatusEnum.COMPLETED] * 2
+
+
+def test_transfer_many_rolls_back_whole_batch(facade, make_account):
+    a = make_account("USER_A", 100.0)
+    b = make_account("USER_B", 0.0)
+
+    with pytest.raises(InsufficientFundsError):
+        facade.transfer_many([
+            {'from_account_id': a, 'to_account_id': b, 'amount': 60.0},
+            {'from_account_id': a, 'to_account_id': b, 'amount': 60.0},
+        ], user_role=Role.EMPLOYEE)
+
+    assert balances(a, b) == [100.0, 0.0]
+    assert statuses(a) == []
+
+
+# Single-statement approval
+
+def test_approve_pending_deposit(facade, make_account):
+    account = make_account("USER_A", 0.0)
+    pending = facade.deposit(account, 30000.0, user_role=Role.CUSTOMER, user_id="USER_A")
+    assert balances(account) == [0.0]
+
+    assert facade._approve_fast(pending.transaction_id, Role.EMPLOYEE, "USER_EMP")
+
+    assert balances(account) == [30000.0]
+    row = db.session.get(TransactionModel, pending.transaction_id)
+    assert (row.status, row.approved_by) == (TransactionStatusEnum.COMPLETED, "USER_EMP")
+
+
+def test_approve_pending_respects_approver_limit(facade, make_account):
+    account = make_account("USER_A", 0.0)
+    pending = facade.deposit(account, 80000.0, user_role=Role.CUSTOMER, user_id="USER_A")
+
+    assert not facade._approve_fast(pending.transaction_id, Role.EMPLOYEE, "USER_EMP")
+    with pytest.raises(UnauthorizedAccessError):
+        facade.approve_transaction(pending.transaction_id, Role.EMPLOYEE, "USER_EMP")
+
+    assert balances(account) == [0.0]
+    assert statuses(account) == [TransactionStatusEnum.PENDING]
+
+
+def test_approve_pending_guard_rejects_overdraft(facade, make_account):
+    account = make_account("USER_A", 40000.0)
+    other = make_account("USER_B", 0.0)
+    pending = facade.withdraw(account, 30000.0, user_role=Role.CUSTOMER, user_id="USER_A")
+    # Drain the account below the pending amount before it is approved
+    facade.transfer(account, other, 20000.0, user_role=Role.CUSTOMER, user_id="USER_A")
+
+    assert not facade._approve_fast(pending.transaction_id, Role.EMPLOYEE, "USER_EMP")
+    assert statuses(account)[0] == TransactionStatusEnum.PENDING
+    with pytest.raises(InsufficientFundsError):
+        facade.approve_transaction(pending.transaction_id, Role.EMPLOYEE, "USER_EMP")
+
+    assert balances(account, other) == [20000.0, 20000.0]
+    assert db.session.get(TransactionModel, pending.transaction_id).status == TransactionStatusEnum.REJECTED
+
+
+# Concurrent process_batch
+
+def run_batch(app, service, txs, timeout=60.0):
+    """Run process_batch on another thread and fail instead of hanging on a deadlock"""
+    outcome = {}
+
+    def target():
+        with app.app_context():
+            outcome['results'] = service.process_batch(txs, user_role=Role.EMPLOYEE)
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    assert not worker.is_alive(), "process_batch did not finish (deadlock?)"
+    return outcome['results']
+
+
+def test_process_batch_ring_of_transfers(app, facade, make_account):
+    accounts = [make_account(f"USER_{n}", 1000.0) for n in range(3)]
+    txs = [
+        {'type': "transfer", 'from_account_id': accounts[i % 3],
+         'to_account_id': accounts[(i + 1) % 3], 'amount': 10.0}
+        for i in range(30)
+    ]
+
+    results = run_batch(app, TransactionService(facade), txs)
+
+    assert all(isinstance(result, Transaction) for result in results)
+    assert balances(*accounts) == [1000.0] * 3
+    assert statuses(accounts[0]).count(TransactionStatusEnum.COMPLETED) == 20
+
+
+def test_process_batch_keeps_order_and_isolates_failures(app, facade, make_account):
+    account = make_account("USER_A", 0.0)
+    empty = make_account("USER_B", 0.0)
+    txs = [
+        {'type': "deposit", 'account_id': account, 'amount': 50.0},
+        {'type': "withdraw", 'account_id': account, 'amount': 50.0},
+        {'type': "withdraw", 'account_id': empty, 'amount': 10.0},
+    ]
+
+    results = run_batch(app, TransactionService(facade), txs)
+
+    assert isinstance(results[0], Transaction)
+    assert isinstance(results[1], Transaction)
+    assert isinstance(results[2], InsufficientFundsError)
+    assert balances(account, empty) == [0.0, 0.0]
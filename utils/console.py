@@ -2,31 +2,59 @@
 Console utilities for cross-platform compatibility
 """
 import sys
-import os
-from flask import Flask
-from database.db import init_db
-from config import DATABASE_URI
+
+
+_console_encoding_done = False
+_app_singleton = None
 
 
 def setup_console_encoding():
     """
     Setup UTF-8 encoding for Windows console.
     Should be called at the start of scripts that output to console.
+    Only the first call does any work.
     """
-    if sys.platform == 'win32':
-        os.system('chcp 65001 >nul 2>&1')
-        if hasattr(sys.stdout, 'reconfigure'):
+    global _console_encoding_done
+    if _console_encoding_done:
+        return
+    _console_encoding_done = True
+    
+    if sys.platform != 'win32':
+        return
+    
+    if sys.stdout.isatty():
+        # Switch the console code page directly instead of spawning `chcp`
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+        ctypes.windll.kernel32.SetConsoleCP(65001)
+    
+    encoding = (getattr(sys.stdout, 'encoding', None) or '').lower()
+    if encoding not in ('utf-8', 'utf8') and hasattr(sys.stdout, 'reconfigure'):
+        try:
             sys.stdout.reconfigure(encoding='utf-8')
+        except (ValueError, OSError):
+            pass
 
 
 def create_app_with_db():
     """
     Create and configure Flask app with database.
-    Returns configured Flask app instance.
+    Returns configured Flask app instance; the app and its engine are
+    built once per process and reused on later calls.
     """
+    global _app_singleton
+    if _app_singleton is not None:
+        return _app_singleton
+
+    # Imported here so console setup alone does not load Flask/SQLAlchemy
+    from flask import Flask
+    from database.db import init_db
+    from config import DATABASE_URI
+    
     app = Flask(__name__)
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     init_db(app)
+    _app_singleton = app
     return app
 
@@ -23,6 +23,11 @@ class InvalidStateTransitionError(BankingSystemError):
     pass
 
 
+class NonIntegerAmountError(InvalidTransactionError):
+    """Raised when an amount is not a whole number of cents"""
+    pass
+
+
 class InsufficientFundsError(BankingSystemError):
     """Raised when account has insufficient funds"""
     pass
@@ -1,33 +1,158 @@
 """
 Centralized logging for Banking System
 """
+import atexit
 import logging
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('banking_system.log'),
-        logging.StreamHandler()
-    ]
+import logging.handlers
+import os
+import queue
+
+import orjson
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+    Structured values passed as extra={'fields': {...}} are merged into the object.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'name': record.name,
+            'msg': record.getMessage(),
+        }
+        exc_info = record.exc_info or getattr(record, 'deferred_exc_info', None)
+        if exc_info:
+            # Cached on the record so each handler does not format it again
+            if not record.exc_text:
+                record.exc_text = self.formatException(exc_info)
+            entry['exc'] = record.exc_text
+        entry.update(getattr(record, 'fields', {}))
+        return orjson.dumps(entry).decode()
+
+
+class _QueueFormatter(logging.Formatter):
+    """
+    Merge args into the message before a record is queued.
+    QueueHandler drops exc_info, so the raw exception tuple is carried along as
+    record.deferred_exc_info and the traceback is formatted by the listener thread.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if record.exc_info:
+            record.deferred_exc_info = record.exc_info
+        return record.getMessage()
+
+
+class _DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that discards the oldest queued record instead of blocking when the queue is full"""
+    
+    def enqueue(self, record: logging.LogRecord):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes through a large buffer.
+    emit() owns the whole write policy: the rollover check uses a byte count kept
+    by the handler (RotatingFileHandler's seek-based check would flush the buffer
+    on every record), and only ERROR records are flushed right away. Everything
+    else reaches the file when the buffer fills, on rollover and on close.
+    """
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=LOG_FILE_BUFFER_SIZE,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            size = len(msg.encode(self.stream.encoding, self.stream.errors))
+            if 0 < self.maxBytes <= self._size + size and self._size > 0:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+# Most records waiting for the listener; beyond this the oldest are dropped
+LOG_QUEUE_MAX_SIZE = 10_000
+
+# Log file rotation and write buffering
+LOG_FILE_MAX_BYTES = 50 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+
+# Records are queued by the calling thread; a background listener does the
+# file and console I/O and traceback formatting so it stays off the request path
+_log_queue = queue.Queue(LOG_QUEUE_MAX_SIZE)
+_queue_handler = _DropOldestQueueHandler(_log_queue)
+# Only merge args into the message here; the listener's handlers build the JSON line
+_queue_handler.setFormatter(_QueueFormatter())
+
+_formatter = OrjsonFormatter()
+# The file is only created once the first record is written
+_file_handler = _BufferedRotatingFileHandler(
+    'banking_system.log', maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT,
+    delay=True
+)
+_file_handler.setFormatter(_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_formatter)
+
+_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
 )
+_listener.start()
+atexit.register(_listener.stop)
 
+# Only the banking_system logger is configured; the root logger is left to the
+# application (or test runner) importing this module
 logger = logging.getLogger('banking_system')
+logger.setLevel(logging.INFO)
+logger.addHandler(_queue_handler)
+logger.propagate = False
 
 
 def log_transaction(transaction_id: str, account_id: str, amount: float, transaction_type: str):
     """Log transaction details"""
-    logger.info(f"Transaction {transaction_id}: {transaction_type} of ${amount:.2f} on account {account_id}")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("transaction", extra={'fields': {
+        'tx_id': transaction_id, 'acc': account_id, 'amt': amount, 'type': transaction_type
+    }})
 
 
 def log_approval(transaction_id: str, approver: str, decision: str):
     """Log approval decisions"""
-    logger.info(f"Approval {transaction_id}: {decision} by {approver}")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("approval", extra={'fields': {
+        'tx_id': transaction_id, 'decision': decision, 'approver': approver
+    }})
 
 
 def log_error(error: Exception, context: str = ""):
     """Log errors"""
-    logger.error(f"Error in {context}: {str(error)}", exc_info=True)
-
+    logger.error("Error in %s: %s", context, error, exc_info=error)
@@ -0,0 +1,39 @@
+"""
+Money helpers: amounts cross the API as floats but are computed in integer cents
+"""
+import math
+
+from utils.exceptions import NonIntegerAmountError
+
+# Largest gap from a whole number of cents still treated as float noise
+_CENT_TOLERANCE = 1e-6
+
+
+def to_cents(amount: float) -> int:
+    """
+    Convert an amount in dollars to integer cents
+    
+    Raises:
+        NonIntegerAmountError: if amount is NaN or infinite
+    """
+    if not math.isfinite(amount):
+        raise NonIntegerAmountError(f"Amount ${amount} is not a finite number")
+    return round(amount * 100)
+
+
+def from_cents(cents: int) -> float:
+    """Convert integer cents back to a dollar amount"""
+    return cents / 100
+
+
+def require_whole_cents(amount: float) -> int:
+    """
+    Convert an amount to cents, rejecting fractions of a cent
+    
+    Raises:
+        NonIntegerAmountError: if amount is not a finite, whole number of cents
+    """
+    cents = to_cents(amount)
+    if abs(amount * 100 - cents) > _CENT_TOLERANCE:
+        raise NonIntegerAmountError(f"Amount ${amount} is not a whole number of cents")
+    return cents